@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Offline benchmark for the theater scrapers.
+
+Record live responses once, then replay them with no network to measure how
+long each scraper's parse() takes on the recorded documents:
+
+    python benchmark.py record
+    python benchmark.py run --repeat 5
+    python benchmark.py compare <old> <new>
+    python benchmark.py render saved_siskel_calendar.html
+    python benchmark.py dates
+    python benchmark.py filter --rows 5000
+
+Results are saved to bench/results/<commit>.json so runs from different
+commits can be compared.
+"""
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import build
+from build import SCRAPERS
+from scrapers import siskel, utils
+from scrapers.models import Catalog
+from scrapers.fixtures import recording, replaying
+
+BENCH_DIR = Path(__file__).parent / 'bench'
+FIXTURE_DIR = BENCH_DIR / 'fixtures'
+RESULTS_DIR = BENCH_DIR / 'results'
+FILTER_PAGE = BENCH_DIR / 'filter_test.html'
+
+# Appended to the filter test page: clicks every theater button and times each
+# click through the forced style/layout, then does the same with the old
+# per-row inline-style filter for comparison.
+FILTER_HARNESS = """
+<script>
+window.addEventListener('load', () => {
+    const REPEAT = %(repeat)d;
+    const buttons = [...document.querySelectorAll('.filter-btn')];
+    const slugs = buttons.map(b => b.dataset.theater);
+    const settle = () => document.body.offsetHeight;
+
+    function legacyFilter(theater) {
+        document.querySelectorAll('.screening').forEach(screening => {
+            const show = theater === 'all' || screening.classList.contains('t-' + theater);
+            screening.style.display = show ? '' : 'none';
+        });
+        document.querySelectorAll('.day-section').forEach(section => {
+            const visible = section.querySelectorAll('.screening:not([style*="display: none"])');
+            section.style.display = visible.length > 0 ? '' : 'none';
+        });
+    }
+
+    function time(apply) {
+        const times = [];
+        for (let i = 0; i < REPEAT; i++) {
+            for (const slug of slugs) {
+                const start = performance.now();
+                apply(slug);
+                settle();
+                times.push(performance.now() - start);
+            }
+        }
+        times.sort((a, b) => a - b);
+        return {median_ms: times[times.length >> 1], max_ms: times[times.length - 1], clicks: times.length};
+    }
+
+    settle();
+    const results = {rows: document.querySelectorAll('.screening').length};
+    results.class_toggle = time(slug => buttons[slugs.indexOf(slug)].click());
+    buttons[0].click();
+    results.inline_styles = time(legacyFilter);
+    legacyFilter('all');
+
+    const out = document.createElement('pre');
+    out.id = 'filter-results';
+    out.textContent = JSON.stringify(results, null, 2);
+    document.body.prepend(out);
+    window.filterResults = results;
+});
+</script>
+"""
+
+
+def select_scrapers(names):
+    """Return the SCRAPERS entries matching `names` (all if empty)."""
+    if not names:
+        return SCRAPERS
+    wanted = {n.lower() for n in names}
+    return [s for s in SCRAPERS if s[0].lower() in wanted]
+
+
+def git_revision():
+    """Short commit hash of the working tree, marked if it has local changes."""
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                             text=True, check=True, cwd=BENCH_DIR.parent).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, cwd=BENCH_DIR.parent).stdout.strip()
+        return f"{rev}-dirty" if dirty else rev
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def record(scrapers, fixture_dir):
+    """Run scrapers live and save every response they fetch."""
+    with recording(fixture_dir) as store:
+        for name, module, _ in scrapers:
+            print(f"Recording {name}...")
+            movies = module.parse(module.fetch())
+            print(f"  {len(movies)} screenings")
+    print(f"\nRecorded {len(store.urls())} responses to {fixture_dir}")
+
+
+def bench_parse(parse, documents, repeat):
+    """Time a scraper's parse() on fixed documents and measure its peak allocations."""
+    movies = parse(documents)  # warm-up
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(documents)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(documents)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {
+        'screenings': len(movies),
+        'median_s': median,
+        'min_s': min(timings),
+        'peak_kib': peak / 1024,
+        'screenings_per_s': len(movies) / median if median else None,
+    }
+
+
+def run(scrapers, fixture_dir, repeat):
+    """Replay fixtures through each scraper and return per-scraper stats."""
+    results = {}
+    with replaying(fixture_dir) as store:
+        for name, module, _ in scrapers:
+            results[name] = bench_parse(module.parse, module.fetch(), repeat)
+        if store.missing:
+            print(f"Warning: {len(set(store.missing))} URLs had no fixture; re-run 'record'")
+    return results
+
+
+def bench_render(page, repeat):
+    """Time Siskel's Playwright render of a saved calendar page.
+
+    The first render includes launching Chromium; later ones reuse the same
+    browser context, as a multi-page fetch would.
+    """
+    url = Path(page).resolve().as_uri()
+    start = time.perf_counter()
+    with siskel.SiskelBrowser() as browser:
+        html = browser.render(url)
+        cold = time.perf_counter() - start
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            browser.render(url)
+            warm.append(time.perf_counter() - start)
+
+    print(f"Rendered {len(html)} bytes from {page}")
+    print(f"  launch + first render: {cold * 1000:.0f}ms")
+    if warm:
+        print(f"  reused browser render: {statistics.median(warm) * 1000:.0f}ms median of {repeat}")
+
+
+def bench_dates(repeat):
+    """Compare parse_date/parse_time against the dateutil and regex-only paths."""
+    import re
+    from datetime import date, timedelta
+
+    days = [date(2026, 1, 1) + timedelta(days=i) for i in range(90)]
+    date_inputs = [d.strftime(f'%A, %B {d.day}') for d in days] + [d.strftime(f'%b {d.day}') for d in days]
+    # Scrapers see each date many times over
+    date_inputs = date_inputs * 10
+    time_inputs = ['7:00pm', '7:00 PM', '11:30am', '9:30 PM', '7pm', '4:45 pm'] * 300
+
+    def old_parse_time(time_str):
+        time_str = time_str.strip().upper()
+        time_str = re.sub(r'(\d{1,2}):(\d{2})\s*(AM|PM)', r'\1:\2 \3', time_str)
+        return re.sub(r'(\d{1,2})(AM|PM)', r'\1:00 \2', time_str)
+
+    def timed(fn, inputs, *args):
+        best = None
+        for _ in range(repeat):
+            utils._parse_date.cache_clear()
+            utils.parse_time.cache_clear()
+            start = time.perf_counter()
+            for value in inputs:
+                fn(value, *args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    rows = [
+        ('parse_date (dateutil)', timed(utils.parse_date_dateutil, date_inputs, 2026), len(date_inputs)),
+        ('parse_date (fast+memo)', timed(utils.parse_date, date_inputs, 2026), len(date_inputs)),
+        ('parse_time (two re.sub)', timed(old_parse_time, time_inputs), len(time_inputs)),
+        ('parse_time (fast+memo)', timed(utils.parse_time, time_inputs), len(time_inputs)),
+    ]
+    print(f"\n{'Parser':<26}{'Calls':>8}{'Total':>11}{'Per call':>11}")
+    print('-' * 56)
+    for name, elapsed, calls in rows:
+        print(f"{name:<26}{calls:>8}{elapsed * 1000:>9.1f}ms{elapsed / calls * 1e6:>9.2f}us")
+
+
+def write_filter_page(rows, repeat, path=FILTER_PAGE):
+    """Render the real week page with `rows` synthetic screenings plus the timing harness."""
+    theaters = [(name, f"https://example.com/{i}") for i, (name, _) in
+                enumerate(sorted(build.SHORT_THEATER_NAMES.items()) + [('Facets', None)])]
+    today = datetime.now(build.CHICAGO_TZ).date()
+    records = []
+    for i in range(rows):
+        name, url = theaters[i % len(theaters)]
+        records.append({
+            'title': f"Film {i // 3}",
+            'theater': name,
+            'theater_url': url,
+            'date': (today + timedelta(days=(i // len(theaters)) % 8)).isoformat(),
+            'times': [f"{1 + i % 11}:{(i * 15) % 60:02d} pm"],
+            'ticket_url': 'https://example.com/tickets',
+        })
+    movies_by_date = build.group_by_date(Catalog().screenings(records))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stylesheet = BENCH_DIR.parent / 'site' / 'styles.css'
+    (path.parent / 'styles.min.css').write_text(build.minify_css(stylesheet.read_text()))
+    build.render_page(BENCH_DIR.parent / 'templates', 'week_template.html', path, root='', site_url='',
+                      page_path=path.name, week_of='', last_updated='',
+                      **build.week_page_context(movies_by_date, today))
+    html = path.read_text(encoding='utf-8')
+    path.write_text(html.replace('</body>', FILTER_HARNESS % {'repeat': repeat} + '</body>'), encoding='utf-8')
+    return path
+
+
+def bench_filter(rows, repeat):
+    """Time the week page's theater filter in headless Chromium."""
+    page_path = write_filter_page(rows, repeat)
+    print(f"Wrote {page_path} ({rows} screenings)")
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("Playwright is not installed; open the page in a browser to see the timings.")
+        return
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            page = browser.new_page()
+            page.goto(page_path.resolve().as_uri())
+            page.wait_for_function('window.filterResults !== undefined', timeout=120000)
+            results = page.evaluate('window.filterResults')
+        finally:
+            browser.close()
+
+    print(f"\n{'Filter':<16}{'Rows':>8}{'Clicks':>8}{'Median':>11}{'Max':>11}")
+    print('-' * 54)
+    for name in ('class_toggle', 'inline_styles'):
+        r = results[name]
+        print(f"{name:<16}{results['rows']:>8}{r['clicks']:>8}{r['median_ms']:>9.2f}ms{r['max_ms']:>9.2f}ms")
+
+
+def print_results(results, baseline=None):
+    """Print a per-scraper table, with change vs. `baseline` if given."""
+    print(f"\n{'Scraper':<20}{'Screenings':>11}{'Median':>10}{'Min':>10}{'Peak KiB':>10}{'Scr/s':>10}{'vs base':>9}")
+    print('-' * 80)
+    for name, r in results.items():
+        change = ''
+        base = (baseline or {}).get(name)
+        if base and base['median_s']:
+            change = f"{(r['median_s'] / base['median_s'] - 1) * 100:+.0f}%"
+        rate = f"{r['screenings_per_s']:.0f}" if r['screenings_per_s'] else '-'
+        print(f"{name:<20}{r['screenings']:>11}{r['median_s'] * 1000:>8.1f}ms{r['min_s'] * 1000:>8.1f}ms"
+              f"{r['peak_kib']:>10.0f}{rate:>10}{change:>9}")
+
+
+def save_results(results, revision, repeat):
+    """Store results under bench/results/<revision>.json."""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{revision}.json"
+    with open(path, 'w') as f:
+        json.dump({
+            'revision': revision,
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'repeat': repeat,
+            'scrapers': results,
+        }, f, indent=2)
+    return path
+
+
+def load_results(ref):
+    """Load saved results by revision name or file path."""
+    path = Path(ref)
+    if not path.exists():
+        path = RESULTS_DIR / f"{ref}.json"
+    with open(path) as f:
+        return json.load(f)
+
+
+def latest_results(exclude):
+    """Most recently saved results other than `exclude`, or None."""
+    if not RESULTS_DIR.exists():
+        return None
+    candidates = sorted((p for p in RESULTS_DIR.glob('*.json') if p.stem != exclude),
+                        key=lambda p: p.stat().st_mtime)
+    return load_results(candidates[-1]) if candidates else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark scraper parsing against recorded fixtures.')
+    parser.add_argument('--fixtures', type=Path, default=FIXTURE_DIR, help='Fixture directory')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='Fetch live pages and save them as fixtures')
+    rec.add_argument('scrapers', nargs='*', help='Scraper names (default: all)')
+
+    bench = sub.add_parser('run', help='Replay fixtures and time each scraper')
+    bench.add_argument('scrapers', nargs='*', help='Scraper names (default: all)')
+    bench.add_argument('--repeat', type=int, default=5, help='Timed runs per scraper')
+    bench.add_argument('--baseline', help='Revision or results file to compare against (default: latest)')
+    bench.add_argument('--no-save', action='store_true', help="Don't write results to bench/results")
+    bench.add_argument('--full-tree', action='store_true',
+                       help='Disable SoupStrainers and build full parse trees, for comparison')
+
+    render = sub.add_parser('render', help='Time the Siskel Playwright render of a saved calendar page')
+    render.add_argument('page', help='Saved copy of the playing-this-month page')
+    render.add_argument('--repeat', type=int, default=3, help='Renders with the reused browser')
+
+    dates = sub.add_parser('dates', help='Microbenchmark date/time parsing')
+    dates.add_argument('--repeat', type=int, default=5, help='Runs per parser (best is reported)')
+
+    filt = sub.add_parser('filter', help='Time the week page theater filter in headless Chromium')
+    filt.add_argument('--rows', type=int, default=5000, help='Synthetic screenings on the page')
+    filt.add_argument('--repeat', type=int, default=5, help='Clicks per theater button')
+
+    cmp_ = sub.add_parser('compare', help='Compare two saved result files')
+    cmp_.add_argument('old')
+    cmp_.add_argument('new')
+
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.command == 'record':
+        record(select_scrapers(args.scrapers), args.fixtures)
+    elif args.command == 'run':
+        revision = git_revision()
+        if args.full_tree:
+            utils.USE_STRAINERS = False
+            revision += '-full-tree'
+        results = run(select_scrapers(args.scrapers), args.fixtures, args.repeat)
+        baseline = load_results(args.baseline) if args.baseline else latest_results(revision)
+        if baseline:
+            print(f"Baseline: {baseline['revision']} ({baseline['timestamp']})")
+        print_results(results, baseline and baseline['scrapers'])
+        if not args.no_save:
+            print(f"\nSaved results to {save_results(results, revision, args.repeat)}")
+    elif args.command == 'render':
+        bench_render(args.page, args.repeat)
+    elif args.command == 'dates':
+        bench_dates(args.repeat)
+    elif args.command == 'filter':
+        bench_filter(args.rows, args.repeat)
+    elif args.command == 'compare':
+        old, new = load_results(args.old), load_results(args.new)
+        print(f"{old['revision']} -> {new['revision']}")
+        print_results(new['scrapers'], old['scrapers'])
+
+
+if __name__ == '__main__':
+    main()
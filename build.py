@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """Build script for Chicago Art House Cinema website."""
+import argparse
+import gzip
+import hashlib
 import json
-import os
+import multiprocessing
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
 try:
     from zoneinfo import ZoneInfo
@@ -13,163 +21,732 @@ except ImportError:
 
 CHICAGO_TZ = ZoneInfo('America/Chicago')
 
-from jinja2 import Environment, FileSystemLoader
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 # Add scrapers to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from scrapers import (
-    scrape_doc_films,
-    scrape_music_box,
-    scrape_logan,
-    scrape_facets,
-    scrape_siskel,
-    scrape_alamo
-)
+from scrapers import alamo, doc_films, facets, logan, music_box, siskel
 from scrapers.letterboxd import enrich_movies_with_letterboxd
+from scrapers.films import FilmIndex
+from scrapers.http_cache import get_http_cache
+from scrapers.models import Catalog, from_tables, to_tables
+from scrapers.utils import load_json, write_json_atomic
 
 
-def format_day(date_str):
-    """Format date as 'Friday, February 7'."""
-    try:
-        dt = datetime.strptime(date_str, '%Y-%m-%d')
-        return dt.strftime('%A, %B %-d')
-    except (ValueError, TypeError):
-        return date_str
+# Compiled templates are kept here between builds
+TEMPLATE_CACHE_DIR = Path(__file__).parent / 'data' / 'template_cache'
 
+SITE_URL = 'https://astagoff2.github.io/third-coast-cinema/'
 
-def filter_to_week(movies):
-    """Filter movies to only include this week (next 7 days)."""
-    today = datetime.now(CHICAGO_TZ).date()
-    week_end = today + timedelta(days=7)
+# Pages rendered at once by generate_site
+RENDER_WORKERS = 4
 
-    filtered = []
-    for movie in movies:
-        try:
-            movie_date = datetime.strptime(movie['date'], '%Y-%m-%d').date()
-            if today <= movie_date <= week_end:
-                filtered.append(movie)
-        except (ValueError, TypeError):
-            continue
-    return filtered
+# Hand-written files in site/, published and compressed along with the generated pages
+STATIC_SITE_FILES = ('styles.css', 'about.html', 'robots.txt', 'sitemap.xml')
 
+# Static JSON API under site/api/v<API_VERSION>/; bump on incompatible changes
+API_VERSION = 1
+API_HASH_LENGTH = 10
 
-def run_scrapers():
-    """Run all scrapers and collect movies."""
-    all_movies = []
+SHORT_THEATER_NAMES = {
+    'Gene Siskel Film Center': 'Siskel',
+    'Music Box Theatre': 'Music Box',
+    'Alamo Drafthouse': 'Alamo',
+    'Logan Theatre': 'Logan',
+    'Doc Films': 'Doc',
+}
 
-    scrapers = [
-        ('Gene Siskel', scrape_siskel),
-        ('Doc Films', scrape_doc_films),
-        ('Music Box', scrape_music_box),
-        ('Logan Theatre', scrape_logan),
-        ('Facets', scrape_facets),
-        ('Alamo Drafthouse', scrape_alamo),
-    ]
 
-    for name, scraper in scrapers:
-        try:
-            print(f"Scraping {name}...")
-            movies = scraper()
-            all_movies.extend(movies)
-            print(f"  Found {len(movies)} screenings")
-        except Exception as e:
-            print(f"  Error scraping {name}: {e}")
-
-    # Filter to current week only
-    all_movies = filter_to_week(all_movies)
+@lru_cache(maxsize=None)
+def format_day(day):
+    """Format a date (or 'YYYY-MM-DD' string) as 'Friday, February 7'."""
+    try:
+        if isinstance(day, str):
+            day = datetime.strptime(day, '%Y-%m-%d')
+        return day.strftime('%A, %B %-d')
+    except (ValueError, TypeError, AttributeError):
+        return day
+
+
+def to_screenings(movies):
+    """Convert scraped dicts to Screenings sharing one Theater/Film per venue and listing."""
+    return Catalog().screenings(movies)
+
+
+def filter_to_week(movies):
+    """Filter screenings to only include this week (next 7 days)."""
+    today = datetime.now(CHICAGO_TZ).date()
+    week_end = today + timedelta(days=7)
+    return [movie for movie in movies if today <= movie.day <= week_end]
+
+
+# (name, scraper module, wall-clock budget in seconds)
+# Each module provides fetch() -> {url: document} and a pure parse(documents).
+SCRAPERS = [
+    ('Gene Siskel', siskel, 90),
+    ('Doc Films', doc_films, 120),
+    ('Music Box', music_box, 60),
+    ('Logan Theatre', logan, 90),
+    ('Facets', facets, 60),
+    ('Alamo Drafthouse', alamo, 60),
+]
+
+# How old a theater's last good scrape may be and still stand in for a failed one
+MAX_STALENESS = timedelta(hours=72)
+
+
+def run_scraper_pool(scrapers, parse_pool=None):
+    """Run scrapers concurrently, each within its own time budget.
+
+    Every scraper fetches on a daemon thread, then parses either on the same
+    thread or, if `parse_pool` (a ProcessPoolExecutor with the spawn start
+    method) is given, in a worker process. A scraper that overruns its budget is abandoned (its thread is
+    left to finish or die with the process) and reported as a timeout.
+    Returns a list of result dicts in scraper order.
+    """
+    results = []
+    for name, module, budget in scrapers:
+        result = {'name': name, 'budget': budget, 'status': None, 'movies': [],
+                  'error': None, 'elapsed': None, 'fetch': None, 'parse': None,
+                  'started': time.monotonic(), 'outcome': None, 'done': threading.Event()}
+
+        def target(result=result, module=module):
+            outcome = {'status': 'ok', 'movies': [], 'error': None, 'fetch': None, 'parse': None}
+            try:
+                documents = module.fetch()
+                fetched = time.monotonic()
+                outcome['fetch'] = fetched - result['started']
+                if parse_pool is not None:
+                    movies = parse_pool.submit(module.parse, documents).result()
+                else:
+                    movies = module.parse(documents)
+                outcome['movies'] = movies or []
+                outcome['parse'] = time.monotonic() - fetched
+            except Exception as e:
+                outcome['status'] = 'error'
+                outcome['error'] = e
+            outcome['elapsed'] = time.monotonic() - result['started']
+            result['outcome'] = outcome
+            result['done'].set()
+
+        threading.Thread(target=target, name=f'scraper-{name}', daemon=True).start()
+        results.append(result)
+
+    for result in results:
+        remaining = result['started'] + result['budget'] - time.monotonic()
+        if result['done'].wait(timeout=max(0, remaining)):
+            result.update(result['outcome'])
+        else:
+            result['status'] = 'timeout'
+            result['elapsed'] = time.monotonic() - result['started']
+
+    return results
+
+
+def print_scraper_report(results, total_elapsed):
+    """Print a per-scraper timing table."""
+    def seconds(value):
+        return f"{value:.1f}s" if value is not None else '-'
+
+    print(f"\n{'Scraper':<20}{'Status':<10}{'Screenings':>11}{'Fetch':>9}{'Parse':>9}{'Time':>9}")
+    print('-' * 68)
+    for result in results:
+        print(f"{result['name']:<20}{result['status']:<10}{len(result['movies']):>11}"
+              f"{seconds(result['fetch']):>9}{seconds(result['parse']):>9}{seconds(result['elapsed']):>9}")
+    print('-' * 68)
+    print(f"{'Total':<30}{sum(len(r['movies']) for r in results):>11}{seconds(total_elapsed):>27}")
+
+
+def load_scraper_cache(cache_path):
+    """Load each theater's last good scrape."""
+    return load_json(cache_path)
+
+
+def save_scraper_cache(cache_path, cache):
+    """Write the per-theater scrape cache."""
+    write_json_atomic(cache_path, cache)
+
+
+def cache_age(entry, now):
+    """Age of a scraper cache entry as a timedelta."""
+    return now - datetime.fromisoformat(entry['scraped_at'])
+
+
+def run_scrapers(scrapers=SCRAPERS, cache_path=None, max_staleness=MAX_STALENESS, reuse_within=None,
+                 parse_pool=None):
+    """Run all scrapers concurrently and collect movies.
+
+    With a `cache_path`, each theater's last non-empty result is saved there.
+    A theater that errors, times out or comes back empty falls back to its
+    cached result if that is no older than `max_staleness`. If `reuse_within`
+    is set, theaters scraped more recently than that are not re-scraped.
+    `parse_pool` is passed through to run_scraper_pool.
+    """
+    all_movies = []
+    cache = load_scraper_cache(cache_path) if cache_path else {}
+    now = datetime.now(CHICAGO_TZ)
+
+    to_run = []
+    reused = {}
+    for name, module, budget in scrapers:
+        entry = cache.get(name)
+        if reuse_within and entry and cache_age(entry, now) < reuse_within:
+            reused[name] = {'name': name, 'budget': budget, 'status': 'cached',
+                            'movies': entry['movies'], 'error': None, 'elapsed': None,
+                            'fetch': None, 'parse': None}
+        else:
+            to_run.append((name, module, budget))
+
+    print(f"Scraping {len(to_run)} theaters...")
+    if reused:
+        print(f"  Reusing recent results for {', '.join(reused)}")
+    start = time.monotonic()
+    fresh = {r['name']: r for r in run_scraper_pool(to_run, parse_pool)}
+    total_elapsed = time.monotonic() - start
+    results = [reused.get(name) or fresh[name] for name, _, _ in scrapers]
+
+    for result in results:
+        name = result['name']
+        if result['status'] == 'error':
+            print(f"  Error scraping {name}: {result['error']}")
+        elif result['status'] == 'timeout':
+            print(f"  Timed out scraping {name} after {result['budget']}s")
+
+        if result['status'] == 'ok' and result['movies']:
+            cache[name] = {'scraped_at': now.isoformat(), 'movies': result['movies']}
+        elif result['status'] != 'cached' and name in cache:
+            age = cache_age(cache[name], now)
+            if age <= max_staleness:
+                print(f"  Using cached {name} results from {age.total_seconds() / 3600:.1f}h ago")
+                result['movies'] = cache[name]['movies']
+                result['status'] = 'fallback'
+        all_movies.extend(result['movies'])
+
+    if cache_path:
+        save_scraper_cache(cache_path, cache)
+
+    print_scraper_report(results, total_elapsed)
+    stats = get_http_cache().stats()
+    print(f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['entries']} entries ({stats['bytes'] / 1024:.0f} KB)")
+
+    # Convert to Screenings once, then filter to current week only
+    all_movies = filter_to_week(to_screenings(all_movies))
     print(f"\nFiltered to {len(all_movies)} screenings this week")
 
     return all_movies
 
 
-def save_data(movies, output_path):
-    """Save movies to JSON file."""
+def save_data(movies, output_path, normalized=False):
+    """Save movies to JSON file.
+
+    By default every screening is written out in full (the README schema).
+    With `normalized`, theaters and films are written once each and
+    referenced by id from the screenings, without indentation; load_data()
+    reads either layout.
+    """
     data = {
         'last_updated': datetime.now().isoformat(),
         'week_of': datetime.now().strftime('%Y-%m-%d'),
-        'movies': movies
     }
 
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    if normalized:
+        data.update(to_tables(movies))
+        write_json_atomic(output_path, data, separators=(',', ':'))
+    else:
+        data['movies'] = [m.to_dict() for m in movies]
+        write_json_atomic(output_path, data, indent=2)
 
     print(f"Saved {len(movies)} screenings to {output_path}")
 
 
-def time_sort_key(movie):
-    """Convert first showtime to sortable value."""
-    times = movie.get('times', [])
-    if not times or times[0] == 'See website':
-        return (2, 0)  # Put "See website" at end
+def load_data(path):
+    """Load Screenings from a movies.json written by save_data (either layout)."""
+    with open(path) as f:
+        data = json.load(f)
+    if 'screenings' in data:
+        return from_tables(data)
+    return to_screenings(data['movies'])
+
+
+def screenings_hash(movies, template_dir, sources, options):
+    """Hash the normalized screening set together with everything it is rendered with.
+
+    Screenings are compared independent of scraper order. The templates, the
+    `sources` files (build.py and the hand-written site files) and the output
+    options (a dict of flags such as client_view) are included so editing any
+    of them, or building with different flags, still triggers a rebuild.
+    """
+    normalized = sorted(json.dumps(m.to_dict(letterboxd=False), sort_keys=True) for m in movies)
+    digest = hashlib.sha256()
+    for line in normalized:
+        digest.update(line.encode())
+        digest.update(b'\n')
+    for template in sorted(Path(template_dir).glob('*.html')):
+        digest.update(template.read_bytes())
+    for source in sources:
+        if Path(source).exists():
+            digest.update(Path(source).read_bytes())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def build_outputs(data_dir, site_dir, client_view=False):
+    """Files and directories a finished build leaves behind."""
+    outputs = [
+        data_dir / 'movies.json',
+        site_dir / 'index.html',
+        site_dir / 'week.html',
+        site_dir / 'styles.min.css',
+        site_dir / 'day',
+        site_dir / 'theater',
+        site_dir / 'api' / f'v{API_VERSION}' / 'manifest.json',
+    ]
+    if client_view:
+        outputs.append(site_dir / 'app.html')
+    return outputs
 
-    time_str = times[0].lower().strip()
-    try:
-        # Parse time like "7:00 pm" or "11:30am"
-        import re
-        match = re.match(r'(\d{1,2}):(\d{2})\s*(am|pm)', time_str)
-        if match:
-            hour = int(match.group(1))
-            minute = int(match.group(2))
-            is_pm = match.group(3) == 'pm'
 
-            if is_pm and hour != 12:
-                hour += 12
-            elif not is_pm and hour == 12:
-                hour = 0
+def load_build_state(state_path):
+    """Load the hash and date recorded by the last build."""
+    return load_json(state_path)
 
-            return (0, hour * 60 + minute)
-    except:
-        pass
-    return (1, 0)  # Unknown times in middle
+
+def save_build_state(state_path, content_hash, build_date):
+    """Record the hash and date of this build."""
+    write_json_atomic(state_path, {'hash': content_hash, 'date': build_date}, indent=2)
+
+
+def time_sort_key(movie):
+    """Sort key from the first showtime's precomputed minutes."""
+    minutes = movie.minutes
+    if not minutes:
+        return (2, 0)  # Put "See website" at end
+    if minutes[0] is None:
+        if movie.times[0] == 'See website':
+            return (2, 0)
+        return (1, 0)  # Unknown times in middle
+    return (0, minutes[0])
 
 
 def group_by_date(movies):
-    """Group movies by date, sorted chronologically, with times sorted within each day."""
+    """Group movies by day, sorted chronologically, with times sorted within each day."""
     by_date = defaultdict(list)
     for movie in movies:
-        by_date[movie['date']].append(movie)
+        by_date[movie.day].append(movie)
 
     # Sort dates and sort movies within each date by showtime
     sorted_dates = sorted(by_date.keys())
-    return {date: sorted(by_date[date], key=time_sort_key) for date in sorted_dates}
+    return {day: sorted(by_date[day], key=time_sort_key) for day in sorted_dates}
+
 
+@lru_cache(maxsize=None)
+def get_environment(template_dir):
+    """Return the Jinja environment for a template directory, created once per process.
 
-def generate_html(movies, template_dir, output_path):
-    """Generate static HTML from template."""
-    env = Environment(loader=FileSystemLoader(template_dir))
+    Compiled templates are cached on disk in TEMPLATE_CACHE_DIR, so later
+    builds skip compiling templates that haven't changed.
+    """
+    TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR)),
+    )
     env.filters['format_day'] = format_day
+    env.filters['short_theater'] = short_theater
+    env.filters['slugify'] = slugify
+    return env
+
+
+def slugify(name):
+    """'Gene Siskel Film Center' -> 'gene-siskel-film-center'."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def short_theater(name):
+    """Theater name as shown on filter buttons."""
+    return SHORT_THEATER_NAMES.get(name, name)
+
+
+def render_page(template_dir, template_name, output_path, **context):
+    """Render one template, streaming it to `output_path`."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    template = get_environment(str(template_dir)).get_template(template_name)
+    template.stream(**context).dump(str(output_path), encoding='utf-8')
+    return output_path
+
+
+def week_page_context(movies_by_date, today):
+    """Template context for the full-week page, with the theater filter's indexes.
+
+    Each theater gets a slug; every screening row carries its theater's slug
+    as a class, and each day (and the Today section) lists the theaters
+    showing anything that day, so the filter needs no counting in the browser.
+    """
+    theater_names = sorted({m.theater.name for screenings in movies_by_date.values() for m in screenings})
+    theater_slugs = {name: slugify(name) for name in theater_names}
+    day_classes = {}
+    for day, screenings in movies_by_date.items():
+        counts = Counter(theater_slugs[m.theater.name] for m in screenings)
+        day_classes[day] = ' '.join(f"has-{slug}" for slug in sorted(counts))
+    return {
+        'movies_by_date': {k: v for k, v in movies_by_date.items() if k != today},
+        'tonight_movies': movies_by_date.get(today, []),
+        'today': today,
+        'theaters': theater_names,
+        'theater_slugs': theater_slugs,
+        'day_classes': day_classes,
+    }
+
 
-    template = env.get_template('index_template.html')
+def generate_site(movies, template_dir, site_dir):
+    """Generate the landing page, the full-week page and per-day and per-theater pages.
+
+    Every page is rendered from one group_by_date() pass, on up to
+    RENDER_WORKERS threads. Pages left over from earlier weeks are removed.
+    Returns (pages written, time taken in seconds).
+    """
+    start = time.monotonic()
+    site_dir = Path(site_dir)
+    now = datetime.now(CHICAGO_TZ)
 
     movies_by_date = group_by_date(movies)
 
     # Get unique theaters
-    theaters = sorted(set(m['theater'] for m in movies))
+    theaters = {}
+    for movie in movies:
+        theaters.setdefault(movie.theater.name, movie.theater)
+    theater_names = sorted(theaters)
 
     # Get tonight's movies
-    today = datetime.now(CHICAGO_TZ).strftime('%Y-%m-%d')
-    tonight_movies = [m for m in movies if m['date'] == today]
+    today = now.date()
+    tonight_movies = movies_by_date.get(today, [])
 
     # Exclude today from movies_by_date since it's in the Today section
     movies_by_date_excluding_today = {k: v for k, v in movies_by_date.items() if k != today}
 
-    html = template.render(
-        movies_by_date=movies_by_date_excluding_today,
-        theaters=theaters,
-        tonight_movies=tonight_movies,
-        week_of=datetime.now(CHICAGO_TZ).strftime('%B %-d, %Y'),
-        last_updated=datetime.now(CHICAGO_TZ).strftime('%B %-d at %-I:%M %p')
-    )
-
-    with open(output_path, 'w') as f:
-        f.write(html)
-
-    print(f"Generated {output_path}")
+    day_pages = {day: f"day/{day.isoformat()}.html" for day in movies_by_date}
+    theater_pages = {name: f"theater/{slugify(name)}.html" for name in theater_names}
 
+    common = {
+        'site_url': SITE_URL,
+        'week_of': now.strftime('%B %-d, %Y'),
+        'last_updated': now.strftime('%B %-d at %-I:%M %p'),
+    }
+    jobs = [
+        ('index_template.html', 'index.html', {
+            'root': '',
+            'theaters': theater_names,
+            'theater_pages': theater_pages,
+            'tonight_movies': tonight_movies,
+            'day_counts': {day: len(screenings) for day, screenings in movies_by_date_excluding_today.items()},
+            'day_pages': day_pages,
+        }),
+        ('week_template.html', 'week.html', {
+            'root': '',
+            **week_page_context(movies_by_date, today),
+        }),
+    ]
+    for day, screenings in movies_by_date.items():
+        jobs.append(('day_template.html', day_pages[day], {'root': '../', 'day': day, 'screenings': screenings}))
+    for name in theater_names:
+        by_date = {}
+        for day, screenings in movies_by_date.items():
+            here = [m for m in screenings if m.theater.name == name]
+            if here:
+                by_date[day] = here
+        jobs.append(('theater_template.html', theater_pages[name],
+                     {'root': '../', 'theater': theaters[name], 'movies_by_date': by_date}))
+
+    # Drop day and theater pages that aren't part of this build
+    wanted = {site_dir / path for _, path, _ in jobs}
+    for subdir in ('day', 'theater'):
+        for stale in (site_dir / subdir).glob('*.html'):
+            if stale not in wanted:
+                stale.unlink()
+
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as pool:
+        futures = [pool.submit(render_page, template_dir, template, site_dir / path,
+                               page_path=path, **common, **context)
+                   for template, path, context in jobs]
+        pages = [f.result() for f in futures]
+
+    elapsed = time.monotonic() - start
+    print(f"Generated {len(pages)} pages in {site_dir}")
+    return pages, elapsed
+
+
+def write_json_file(directory, name, payload):
+    """Write compact JSON as `<name>.<content hash>.json` under `directory` and return its path.
+
+    An unchanged payload maps to the same file, which is then left alone.
+    """
+    body = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()[:API_HASH_LENGTH]
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.{digest}.json"
+    if not path.exists():
+        path.write_bytes(body)
+    return path
+
+
+def manifest_files(manifest):
+    """Every slice file an API manifest points at."""
+    files = {manifest['week'], *manifest['days'].values()}
+    files.update(entry['path'] for group in ('theaters', 'films') for entry in manifest[group].values())
+    return files
+
+
+def film_slug(ident):
+    """API key for a FilmIndex identity: 'queen kelly|1929' -> 'queen-kelly-1929'.
+
+    A title with no ASCII letters or digits ('東京物語') gets a short hash
+    of its key instead, so such films don't all share one empty slug.
+    """
+    key, _, year = ident.partition('|')
+    slug = slugify(key) or 'film-' + hashlib.sha256(key.encode('utf-8')).hexdigest()[:API_HASH_LENGTH]
+    return f"{slug}-{year}" if year else slug
+
+
+def write_api(movies, site_dir):
+    """Write the schedule as static JSON under site/api/v<API_VERSION>/.
+
+    Slices for the whole week, each day, each theater and each film are
+    written in the normalized to_tables() layout, with a content hash in
+    each filename so they can be cached indefinitely. manifest.json (not
+    hashed) maps every slice to its current file. Files from the previous
+    manifest are kept for one more build so clients holding it still
+    resolve; anything older is removed. Returns the time taken in seconds.
+    """
+    start = time.monotonic()
+    api_dir = Path(site_dir) / 'api' / f"v{API_VERSION}"
+    manifest_path = api_dir / 'manifest.json'
+    try:
+        previous = manifest_files(load_json(manifest_path))
+    except (KeyError, AttributeError):
+        previous = set()
 
-def main():
+    movies_by_date = group_by_date(movies)
+    by_theater = defaultdict(list)
+    by_film = defaultdict(list)
+    film_titles = {}
+    # Same grouping as the Letterboxd lookups, so one film at two theaters is one slice
+    film_index = FilmIndex()
+    for movie in movies:
+        film_index.add(movie.film.title, movie.film.year)
+    for screenings in movies_by_date.values():
+        for movie in screenings:
+            by_theater[movie.theater.name].append(movie)
+            ident, title, _ = film_index.resolve(movie.film.title, movie.film.year)
+            key = film_slug(ident)
+            by_film[key].append(movie)
+            film_titles.setdefault(key, title)
+
+    def rel(path):
+        return path.relative_to(api_dir).as_posix()
+
+    ordered = [m for screenings in movies_by_date.values() for m in screenings]
+    manifest = {
+        'version': API_VERSION,
+        'generated': datetime.now(CHICAGO_TZ).isoformat(),
+        'week': rel(write_json_file(api_dir, 'week', to_tables(ordered))),
+        'days': {
+            day.isoformat(): rel(write_json_file(api_dir / 'day', day.isoformat(), to_tables(screenings)))
+            for day, screenings in movies_by_date.items()
+        },
+        'theaters': {
+            slugify(name): {'name': name,
+                            'path': rel(write_json_file(api_dir / 'theater', slugify(name), to_tables(screenings)))}
+            for name, screenings in sorted(by_theater.items())
+        },
+        'films': {
+            key: {'title': film_titles[key],
+                  'path': rel(write_json_file(api_dir / 'film', key, to_tables(screenings)))}
+            for key, screenings in sorted(by_film.items())
+        },
+    }
+    current = manifest_files(manifest)
+
+    for path in api_dir.rglob('*.json'):
+        if path != manifest_path and rel(path) not in current | previous:
+            path.unlink()
+    write_json_atomic(manifest_path, manifest, separators=(',', ':'))
+
+    elapsed = time.monotonic() - start
+    print(f"Wrote {len(current)} API files to {api_dir}")
+    return elapsed
+
+
+# Contents of these elements are left alone by minify_html
+HTML_RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)', re.IGNORECASE | re.DOTALL)
+HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+# Whitespace around these tags never renders
+HTML_BLOCK_TAG = re.compile(
+    r'\s*(</?(?:!doctype|html|head|body|title|meta|link|script|style|main|header|footer|nav|section|'
+    r'div|p|ul|ol|li|h[1-6])\b[^>]*>)\s*', re.IGNORECASE)
+CSS_TOKEN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|(\s+)', re.DOTALL)
+CSS_PUNCTUATION = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|\s*;\s*(})\s*|\s*([{};,>])\s*|(:)\s+')
+
+# Extensions that get .gz/.br siblings
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.xml', '.txt', '.svg')
+
+
+def minify_css(css):
+    """Drop comments and insignificant whitespace from a stylesheet, leaving strings intact."""
+    css = CSS_TOKEN.sub(lambda m: m.group(1) or (' ' if m.group(2) else ''), css)
+    return CSS_PUNCTUATION.sub(lambda m: m.group(1) or m.group(2) or m.group(3) or m.group(4), css).strip()
+
+
+def minify_html(html):
+    """Collapse whitespace in generated HTML without changing how it renders.
+
+    Runs of whitespace become one space, and whitespace next to block-level
+    tags is removed. <pre>, <textarea> and <script> contents are kept as is;
+    <style> contents go through minify_css.
+    """
+    def squeeze(text):
+        text = HTML_COMMENT.sub('', text)
+        text = re.sub(r'\s+', ' ', text)
+        return HTML_BLOCK_TAG.sub(r'\1', text)
+
+    parts = []
+    pos = 0
+    for match in HTML_RAW_BLOCK.finditer(html):
+        parts.append(squeeze(html[pos:match.start()]))
+        body = match.group(3)
+        if match.group(2).lower() == 'style':
+            body = minify_css(body)
+        # The opening tag still gets block-tag whitespace trimming via squeeze
+        parts.append(squeeze(match.group(1)) + body + match.group(4))
+        pos = match.end()
+    parts.append(squeeze(html[pos:]))
+    return ''.join(parts).strip()
+
+
+def compress_file(path):
+    """Write maximum-compression .gz (and .br, if brotli is installed) siblings.
+
+    Returns {'gzip': bytes, 'brotli': bytes or None}.
+    """
+    data = path.read_bytes()
+    # mtime=0 keeps the .gz identical when the content is
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + '.gz').write_bytes(gz)
+    sizes = {'gzip': len(gz), 'brotli': None}
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        path.with_name(path.name + '.br').write_bytes(br)
+        sizes['brotli'] = len(br)
+    return sizes
+
+
+def write_stylesheet(site_dir):
+    """Minify site/styles.css to site/styles.min.css, which every page links.
+
+    Runs on every build, --no-minify included, so pages never point at a
+    missing stylesheet. Returns the size of styles.css in bytes.
+    """
+    site_dir = Path(site_dir)
+    css = (site_dir / 'styles.css').read_text(encoding='utf-8')
+    (site_dir / 'styles.min.css').write_text(minify_css(css), encoding='utf-8')
+    return len(css.encode('utf-8'))
+
+
+def compressed_files(site_dir):
+    """The .gz and .br files under `site_dir`."""
+    site_dir = Path(site_dir)
+    return list(site_dir.rglob('*.gz')) + list(site_dir.rglob('*.br'))
+
+
+def optimize_site(site_dir, pages):
+    """Minify generated pages and the stylesheet, then pre-compress the site.
+
+    `pages` are generated HTML files and are minified in place. The
+    hand-written site/styles.css is minified to site/styles.min.css, which
+    the pages link to. Every text asset then gets .gz and .br siblings for
+    hosts that serve pre-compressed files. Prints before/after sizes and
+    returns the time taken in seconds.
+    """
+    start = time.monotonic()
+    site_dir = Path(site_dir)
+    original = {}
+
+    for page in pages:
+        page = Path(page)
+        html = page.read_text(encoding='utf-8')
+        original[page.relative_to(site_dir)] = len(html.encode('utf-8'))
+        page.write_text(minify_html(html), encoding='utf-8')
+
+    original[Path('styles.min.css')] = write_stylesheet(site_dir)
+
+    # Clear out siblings of files that no longer exist
+    for sibling in compressed_files(site_dir):
+        if not sibling.with_suffix('').exists():
+            sibling.unlink()
+
+    rows = []
+    for path in sorted(site_dir.rglob('*')):
+        if path.is_file() and path.suffix in COMPRESSIBLE:
+            name = path.relative_to(site_dir)
+            size = path.stat().st_size
+            rows.append((name, original.get(name, size), size, compress_file(path)))
+
+    if brotli is None:
+        print("\nbrotli is not installed; writing .gz files only")
+    width = max([len(str(r[0])) for r in rows] + [20]) + 2
+    print(f"\n{'File':<{width}}{'Original':>10}{'Minified':>10}{'gzip':>10}{'brotli':>10}")
+    print('-' * (width + 40))
+    for name, before, after, packed in rows:
+        br = packed['brotli'] if packed['brotli'] is not None else '-'
+        print(f"{str(name):<{width}}{before:>10}{after:>10}{packed['gzip']:>10}{br:>10}")
+    print('-' * (width + 40))
+    totals = [sum(r[1] for r in rows), sum(r[2] for r in rows), sum(r[3]['gzip'] for r in rows)]
+    br_total = sum(r[3]['brotli'] for r in rows) if brotli is not None else '-'
+    print(f"{'Total':<{width}}{totals[0]:>10}{totals[1]:>10}{totals[2]:>10}{br_total:>10}")
+
+    return time.monotonic() - start
+
+
+def print_build_report(stages):
+    """Print how long each build stage took."""
+    print(f"\n{'Stage':<20}{'Time':>9}")
+    print('-' * 29)
+    for stage, elapsed in stages.items():
+        print(f"{stage:<20}{elapsed:>8.2f}s")
+    print('-' * 29)
+    print(f"{'Total':<20}{sum(stages.values()):>8.2f}s")
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='Build the Third Coast Cinema site.')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate data and HTML even if screenings are unchanged')
+    parser.add_argument('--max-staleness', type=float, metavar='HOURS',
+                        default=MAX_STALENESS.total_seconds() / 3600,
+                        help='Oldest cached theater results to fall back to when a scraper fails')
+    parser.add_argument('--fast', type=float, metavar='HOURS',
+                        help='Only re-scrape theaters whose cached results are older than HOURS')
+    parser.add_argument('--parse-workers', type=int, default=0, metavar='N',
+                        help='Parse scraped pages in N worker processes (default: parse on the fetch threads)')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='Leave generated HTML unminified and skip writing .gz/.br files')
+    parser.add_argument('--client-view', action='store_true',
+                        help='Also write app.html, which renders any slice of the JSON API in the browser')
+    parser.add_argument('--normalized-data', action='store_true',
+                        help='Write movies.json as compact theater/film/screening tables')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main build process."""
+    args = parse_args(argv)
     base_dir = Path(__file__).parent
     data_dir = base_dir / 'data'
     site_dir = base_dir / 'site'
@@ -184,8 +761,25 @@ def main():
     print("=" * 50)
     print()
 
+    stages = {}
+
     # Run scrapers
-    movies = run_scrapers()
+    start = time.monotonic()
+    # Workers are started from the scraper threads; forking a threaded process can
+    # copy a held lock into the child, so start them fresh with spawn
+    parse_pool = (ProcessPoolExecutor(max_workers=args.parse_workers, mp_context=multiprocessing.get_context('spawn'))
+                  if args.parse_workers > 0 else None)
+    try:
+        movies = run_scrapers(
+            cache_path=data_dir / 'scraper_cache.json',
+            max_staleness=timedelta(hours=args.max_staleness),
+            reuse_within=timedelta(hours=args.fast) if args.fast else None,
+            parse_pool=parse_pool,
+        )
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+    stages['Scrape'] = time.monotonic() - start
 
     if not movies:
         print("\nNo movies found. Using sample data for testing.")
@@ -203,17 +797,57 @@ def main():
                 'ticket_url': 'https://musicboxtheatre.com'
             }
         ]
+        movies = to_screenings(movies)
+
+    # Skip the rest of the build if nothing moved since the last run
+    state_path = data_dir / 'build_state.json'
+    options = {'client_view': args.client_view, 'normalized_data': args.normalized_data,
+               'no_minify': args.no_minify}
+    sources = [Path(__file__)] + [site_dir / name for name in STATIC_SITE_FILES]
+    content_hash = screenings_hash(movies, template_dir, sources, options)
+    build_date = datetime.now(CHICAGO_TZ).strftime('%Y-%m-%d')
+    state = load_build_state(state_path)
+    outputs_exist = all(path.exists() for path in build_outputs(data_dir, site_dir, args.client_view))
+    if (not args.force and outputs_exist
+            and state.get('hash') == content_hash and state.get('date') == build_date):
+        print("\nScreenings unchanged since last build - skipping enrichment and rendering.")
+        print("Use --force to rebuild anyway.")
+        return
 
     # Enrich with Letterboxd data
     print("\nFetching Letterboxd data...")
+    start = time.monotonic()
     movies = enrich_movies_with_letterboxd(movies)
+    stages['Letterboxd'] = time.monotonic() - start
 
     # Save data
-    save_data(movies, data_dir / 'movies.json')
+    start = time.monotonic()
+    save_data(movies, data_dir / 'movies.json', normalized=args.normalized_data)
+    stages['Save data'] = time.monotonic() - start
 
     # Generate HTML
-    generate_html(movies, template_dir, site_dir / 'index.html')
-
+    pages, stages['Render'] = generate_site(movies, template_dir, site_dir)
+    stages['JSON API'] = write_api(movies, site_dir)
+    app_page = site_dir / 'app.html'
+    if args.client_view:
+        pages.append(render_page(template_dir, 'app_template.html', app_page, root='', site_url=SITE_URL,
+                                 page_path='app.html', api_version=API_VERSION,
+                                 last_updated=datetime.now(CHICAGO_TZ).strftime('%B %-d at %-I:%M %p'),
+                                 week_of=datetime.now(CHICAGO_TZ).strftime('%B %-d, %Y')))
+    elif app_page.exists():
+        app_page.unlink()
+
+    if not args.no_minify:
+        stages['Minify + compress'] = optimize_site(site_dir, pages)
+    else:
+        # Unminified pages would otherwise be served from stale pre-compressed copies
+        write_stylesheet(site_dir)
+        for sibling in compressed_files(site_dir):
+            sibling.unlink()
+
+    save_build_state(state_path, content_hash, build_date)
+
+    print_build_report(stages)
     print()
     print("Build complete!")
 
@@ -1,4 +1,5 @@
 """Scraper for Alamo Drafthouse Wrigleyville."""
+from .http_cache import get_http_cache
 from .utils import make_request, logger
 import json
 from datetime import datetime
@@ -15,19 +16,28 @@ THEATER_INFO = {
 WRIGLEYVILLE_CINEMA_ID = '1801'
 
 
-def scrape_alamo():
-    """Scrape Alamo Drafthouse Wrigleyville schedule via their API."""
-    movies = []
+API_URL = 'https://drafthouse.com/s/mother/v2/schedule/market/chicago'
 
-    api_url = 'https://drafthouse.com/s/mother/v2/schedule/market/chicago'
 
-    resp = make_request(api_url)
+def fetch():
+    """Fetch the Chicago market schedule. Returns {url: json text}."""
+    resp = make_request(API_URL, cache=get_http_cache())
     if not resp:
         logger.error("Failed to fetch Alamo Drafthouse API")
+        return {}
+    return {API_URL: resp.text}
+
+
+def parse(documents):
+    """Parse the schedule API response into Wrigleyville screenings."""
+    movies = []
+
+    text = documents.get(API_URL)
+    if not text:
         return movies
 
     try:
-        data = resp.json().get('data', {})
+        data = json.loads(text).get('data', {})
     except json.JSONDecodeError:
         logger.error("Failed to parse Alamo Drafthouse JSON")
         return movies
@@ -113,6 +123,11 @@ def scrape_alamo():
     return movies
 
 
+def scrape_alamo():
+    """Scrape Alamo Drafthouse Wrigleyville schedule via their API."""
+    return parse(fetch())
+
+
 if __name__ == '__main__':
     results = scrape_alamo()
     for m in sorted(results, key=lambda x: (x['date'], x['title'])):
@@ -1,8 +1,12 @@
 """Scraper for Doc Films (University of Chicago)."""
-from bs4 import BeautifulSoup
-from .utils import make_request, parse_date, parse_time, clean_text, logger
+from bs4 import SoupStrainer
+from .http_cache import get_http_cache
+from .utils import (make_request, make_soup, parse_date, parse_time, clean_text, load_json, logger,
+                    state_path, write_json_atomic)
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
 
 
 THEATER_INFO = {
@@ -11,17 +15,68 @@ THEATER_INFO = {
     'address': 'Max Palevsky Cinema, Ida Noyes Hall, 1212 E 59th St'
 }
 
+# Only links are needed from the calendar, only screening blocks from series pages
+LINK_STRAINER = SoupStrainer('a', href=True)
+SCREENING_STRAINER = SoupStrainer('div', class_='screening')
 
-def get_series_urls():
-    """Get all series page URLs from the calendar page."""
-    base_url = 'https://docfilms.org'
-    calendar_url = f'{base_url}/calendar/'
+BASE_URL = 'https://docfilms.org'
+CALENDAR_URL = f'{BASE_URL}/calendar/'
 
-    resp = make_request(calendar_url)
+# Series pages fetched at once
+SERIES_WORKERS = 4
+
+# While the calendar is unchanged, a series page requested this recently is
+# read from the HTTP cache without asking the server again
+SERIES_RECHECK = timedelta(days=7)
+
+# Per-quarter series URL list and when each series page was last requested
+CACHE_FILE = Path(__file__).parent.parent / 'data' / 'doc_films_cache.json'
+
+
+def load_series_cache():
+    """Load the per-quarter Doc Films cache."""
+    return load_json(state_path(CACHE_FILE))
+
+
+def save_series_cache(cache):
+    """Write the per-quarter Doc Films cache."""
+    write_json_atomic(state_path(CACHE_FILE), cache)
+
+
+def quarter_of(urls):
+    """Quarter key (e.g. '2026winter') for a set of series URLs."""
+    quarters = sorted({m.group(1) for m in (re.search(r'/calendar/(\d{4}\w+?)/', u) for u in urls) if m})
+    return '+'.join(quarters)
+
+
+def calendar_validator():
+    """ETag/Last-Modified the HTTP cache holds for the calendar page."""
+    entry = get_http_cache().entry(CALENDAR_URL)
+    if not entry:
+        return None
+    return entry.get('etag') or entry.get('last_modified')
+
+
+def get_series_urls(cache=None):
+    """Get all series page URLs from the calendar page.
+
+    Returns (urls, unchanged). If the calendar revalidates unchanged (same
+    validator as when `cache` was written), the cached list for the quarter
+    is reused without parsing and `unchanged` is True.
+    """
+    base_url = BASE_URL
+    calendar_url = CALENDAR_URL
+
+    resp = make_request(calendar_url, cache=get_http_cache())
     if not resp:
-        return []
+        return [], False
+
+    validator = calendar_validator()
+    if (cache is not None and resp.from_cache and validator
+            and cache.get('calendar_validator') == validator and cache.get('series_urls')):
+        return list(cache['series_urls']), True
 
-    soup = BeautifulSoup(resp.text, 'lxml')
+    soup = make_soup(resp.text, LINK_STRAINER)
     series_urls = set()
 
     # Find all series links (format: /calendar/2026winter/series-name)
@@ -31,20 +86,24 @@ def get_series_urls():
             full_url = base_url + href
             series_urls.add(full_url)
 
-    return list(series_urls)
+    if cache is not None:
+        cache['calendar_validator'] = validator
+        cache['series_urls'] = sorted(series_urls)
+    return list(series_urls), False
 
 
-def parse_series_page(url):
-    """Parse a series page and extract all screenings."""
+def fetch_series_page(url):
+    """Fetch one series page, returning its HTML or None."""
+    resp = make_request(url, cache=get_http_cache())
+    return resp.text if resp else None
+
+
+def parse_series_html(url, html):
+    """Extract all screenings from a series page's HTML."""
     movies = []
-    base_url = 'https://docfilms.org'
     current_year = datetime.now().year
 
-    resp = make_request(url)
-    if not resp:
-        return movies
-
-    soup = BeautifulSoup(resp.text, 'lxml')
+    soup = make_soup(html, SCREENING_STRAINER)
 
     # Find all screening divs
     screenings = soup.find_all('div', class_='screening')
@@ -117,29 +176,86 @@ def parse_series_page(url):
     return movies
 
 
-def scrape_doc_films():
-    """Scrape Doc Films schedule from all series pages."""
+def parse_series_page(url):
+    """Fetch and parse a series page, returning all screenings."""
+    html = fetch_series_page(url)
+    return parse_series_html(url, html) if html else []
+
+
+def fetch():
+    """Fetch every series page linked from the calendar. Returns {url: html}.
+
+    Series pages are fetched concurrently through the conditional-GET cache,
+    so pages that have not changed since the last build come back as 304s.
+    A series rarely changes mid-quarter without the calendar changing too, so
+    while the calendar revalidates unchanged, pages requested within
+    SERIES_RECHECK are read straight from the HTTP cache with no request.
+    """
+    cache = load_series_cache()
+    series_urls, calendar_unchanged = get_series_urls(cache)
+    series_urls = sorted(series_urls)
+    logger.info(f"Doc Films: Found {len(series_urls)} series pages")
+    if not series_urls:
+        return {}
+
+    cache = reset_quarter(cache, quarter_of(series_urls))
+    checked = cache.get('checked', {})
+    now = datetime.now()
+    stamp = now.isoformat()
+
+    def fetch_series(url):
+        last = checked.get(url)
+        if calendar_unchanged and last and now - datetime.fromisoformat(last) < SERIES_RECHECK:
+            html = get_http_cache().stored_text(url)
+            if html is not None:
+                return html, last
+        return fetch_series_page(url), stamp
+
+    with ThreadPoolExecutor(max_workers=SERIES_WORKERS) as pool:
+        pages = dict(zip(series_urls, pool.map(fetch_series, series_urls)))
+
+    skipped = sum(1 for _, when in pages.values() if when != stamp)
+    if skipped:
+        logger.info(f"Doc Films: {skipped} unchanged series read from cache without a request")
+    # Only series still linked from the calendar, and only ones that came back
+    cache['checked'] = {url: when for url, (html, when) in pages.items() if html}
+    save_series_cache(cache)
+    return {url: html for url, (html, _) in pages.items() if html}
+
+
+def reset_quarter(cache, quarter):
+    """Drop cached series from other quarters."""
+    if cache.get('quarter') != quarter:
+        cache = {k: v for k, v in cache.items() if k in ('calendar_validator', 'series_urls')}
+        cache['quarter'] = quarter
+    return cache
+
+
+def merge_series(pages):
+    """Combine per-series screening lists, deduplicated across series."""
     movies = []
     seen = set()
-
-    # Get all series page URLs
-    series_urls = get_series_urls()
-    logger.info(f"Doc Films: Found {len(series_urls)} series pages")
-
-    # Parse each series page
-    for url in series_urls:
-        page_movies = parse_series_page(url)
+    for page_movies in pages:
         for movie in page_movies:
             # Deduplicate by title+date+time
             key = f"{movie['title']}|{movie['date']}|{movie['times'][0]}"
             if key not in seen:
                 seen.add(key)
                 movies.append(movie)
-
     logger.info(f"Doc Films: Found {len(movies)} total screenings")
     return movies
 
 
+def parse(documents):
+    """Parse fetched series pages into screenings, deduplicated across series."""
+    return merge_series(parse_series_html(url, html) for url, html in documents.items())
+
+
+def scrape_doc_films():
+    """Scrape Doc Films schedule from all series pages."""
+    return parse(fetch())
+
+
 if __name__ == '__main__':
     results = scrape_doc_films()
     for m in sorted(results, key=lambda x: x['date']):
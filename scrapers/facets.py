@@ -1,6 +1,7 @@
 """Scraper for Facets Cinematheque."""
-from bs4 import BeautifulSoup
-from .utils import make_request, parse_date, parse_time, clean_text, logger
+from bs4 import SoupStrainer
+from .http_cache import get_http_cache
+from .utils import make_request, make_soup, parse_date, parse_time, clean_text, logger
 import re
 from datetime import datetime
 
@@ -12,18 +13,33 @@ THEATER_INFO = {
 }
 
 
-def scrape_facets():
-    """Scrape Facets screening schedule."""
-    movies = []
-    base_url = 'https://facets.org'
+BASE_URL = 'https://facets.org'
+# Use cinema page which lists screenings
+CINEMA_URL = f'{BASE_URL}/cinema/'
+
+# Portfolio items, plus bare titles for the fallback below
+ITEM_STRAINER = SoupStrainer(class_=re.compile(r'portfolio-item|edgtf-pli-title'))
 
-    # Use cinema page which lists screenings
-    resp = make_request(f'{base_url}/cinema/')
+
+def fetch():
+    """Fetch the cinema page. Returns {url: html}."""
+    resp = make_request(CINEMA_URL, cache=get_http_cache())
     if not resp:
         logger.error("Failed to fetch Facets")
+        return {}
+    return {CINEMA_URL: resp.text}
+
+
+def parse(documents):
+    """Parse the cinema page into screenings."""
+    movies = []
+    base_url = BASE_URL
+
+    html = documents.get(CINEMA_URL)
+    if not html:
         return movies
 
-    soup = BeautifulSoup(resp.text, 'lxml')
+    soup = make_soup(html, ITEM_STRAINER)
     current_year = datetime.now().year
 
     # Facets uses portfolio list items with class 'edgtf-pli-title'
@@ -102,6 +118,11 @@ def scrape_facets():
     return movies
 
 
+def scrape_facets():
+    """Scrape Facets screening schedule."""
+    return parse(fetch())
+
+
 if __name__ == '__main__':
     results = scrape_facets()
     for m in results:
@@ -0,0 +1,119 @@
+"""Recognize the same film across theaters despite differences in how it is listed."""
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from .utils import load_json, write_json_atomic
+
+INDEX_FILE = Path(__file__).parent.parent / 'data' / 'film_index.json'
+
+YEAR_SUFFIX = re.compile(r'\s*[\(\[]((?:18|19|20)\d{2})[\)\]]\s*$')
+LEADING_ARTICLE = re.compile(r'^the\s+')
+NON_WORD = re.compile(r'[^\w\s]')
+WHITESPACE = re.compile(r'\s+')
+
+
+def split_year(title):
+    """Split a trailing '(1929)' off a title: returns (title, year or None)."""
+    match = YEAR_SUFFIX.search(title)
+    if not match:
+        return title.strip(), None
+    return title[:match.start()].strip(), int(match.group(1))
+
+
+def title_key(title):
+    """Normalized form of a title for matching.
+
+    Case, accents, punctuation, a year suffix and a leading "The" are
+    ignored, so "The Mother & the Whore (1973)" and "MOTHER AND THE WHORE"
+    get the same key.
+    """
+    title, _ = split_year(title)
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(c for c in title if not unicodedata.combining(c)).casefold()
+    title = title.replace("'", '').replace('\u2019', '').replace('&', ' and ')
+    title = NON_WORD.sub(' ', title)
+    title = WHITESPACE.sub(' ', title).strip()
+    return LEADING_ARTICLE.sub('', title)
+
+
+def display_score(title):
+    """Prefer mixed-case listings ("Queen Kelly") over all-caps ones for lookups."""
+    return (title != title.upper(), -len(title))
+
+
+class FilmIndex:
+    """Maps listed (title, year) pairs to one identity per film.
+
+    An identity is (title_key, year). A listing without a year joins the one
+    identity with a year for its title when exactly one such year is listed
+    in this build; with several candidate years, or none, it stays separate.
+    Years from earlier builds are not used, so a film listed with a year last
+    month does not claim a different film's year-less listing today.
+
+    Only the outcome is kept in `path`: the display title of each identity
+    this build resolved to, so a film keeps the same lookup title from one
+    run to the next while it is showing.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._years = {}
+        self._titles = {}
+        self._saved = load_json(self.path).get('titles', {})
+
+    @staticmethod
+    def _id(key, year):
+        return f"{key}|{year}" if year else key
+
+    def add(self, title, year=None):
+        """Record a listing of this build so its year can resolve year-less variants."""
+        bare, suffix_year = split_year(title)
+        year = year or suffix_year
+        key = title_key(bare)
+        with self._lock:
+            if year:
+                self._years.setdefault(key, set()).add(year)
+
+    def resolve(self, title, year=None):
+        """Return (identity, display title, year) for a listing."""
+        bare, suffix_year = split_year(title)
+        year = year or suffix_year
+        key = title_key(bare)
+        with self._lock:
+            if not year:
+                years = self._years.get(key, ())
+                if len(years) == 1:
+                    year = next(iter(years))
+            ident = self._id(key, year)
+            current = self._titles.get(ident) or self._saved.get(ident)
+            if current is None or display_score(bare) > display_score(current):
+                current = bare
+            self._titles[ident] = current
+            return ident, current, year
+
+    def group(self, films):
+        """Group (title, year) pairs by identity.
+
+        Returns a list of (display title, year, [(title, year), ...]) with
+        one entry per distinct film.
+        """
+        films = list(films)
+        for title, year in films:
+            self.add(title, year)
+        groups = {}
+        for title, year in films:
+            ident, _, resolved_year = self.resolve(title, year)
+            groups.setdefault(ident, (resolved_year, []))[1].append((title, year))
+        # Display titles are final only once every listing has been resolved
+        return [(self._titles[ident], year, listings) for ident, (year, listings) in groups.items()]
+
+    def flush(self):
+        """Write this build's resolutions to disk via temp file + rename, if they changed."""
+        with self._lock:
+            titles = dict(sorted(self._titles.items()))
+            if titles == self._saved:
+                return
+            write_json_atomic(self.path, {'titles': titles}, indent=2)
+            self._saved = titles
@@ -0,0 +1,147 @@
+"""Record scraper HTTP responses to fixture files and replay them offline."""
+import hashlib
+import json
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from . import utils
+from .utils import logger
+
+DATE_IN_URL = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+class FixtureStore:
+    """Directory of recorded responses keyed by URL.
+
+    In 'record' mode every successful make_request() response (and every
+    rendered Siskel page) is written to disk. In 'replay' mode make_request()
+    serves those files instead of touching the network. URLs containing a
+    YYYY-MM-DD date (Logan's per-day pages) are shifted by the number of days
+    since recording, so a replay on a later day still finds its fixtures.
+
+    Scraper state that normally lives under data/ goes to `state_dir`
+    instead while the store is active (see utils.state_path).
+    """
+
+    def __init__(self, path, mode, state_dir=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.state_dir = Path(state_dir) if state_dir else None
+        self.missing = []
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        if mode == 'record':
+            self._manifest['recorded_on'] = date.today().isoformat()
+            self._manifest.setdefault('responses', {})
+
+    @property
+    def manifest_file(self):
+        return self.path / 'manifest.json'
+
+    def _load_manifest(self):
+        if self.manifest_file.exists():
+            with open(self.manifest_file) as f:
+                return json.load(f)
+        return {'responses': {}}
+
+    def _save_manifest(self):
+        utils.write_json_atomic(self.manifest_file, self._manifest, indent=2, sort_keys=True)
+
+    def _shifted_url(self, url):
+        recorded_on = self._manifest.get('recorded_on')
+        if not recorded_on:
+            return url
+        shift = date.today() - date.fromisoformat(recorded_on)
+
+        def shift_back(match):
+            day = datetime.strptime(match.group(0), '%Y-%m-%d').date()
+            return (day - shift).isoformat()
+
+        return DATE_IN_URL.sub(shift_back, url)
+
+    def _entry(self, url):
+        responses = self._manifest.get('responses', {})
+        return responses.get(url) or responses.get(self._shifted_url(url))
+
+    def urls(self):
+        """Return every recorded URL."""
+        return sorted(self._manifest.get('responses', {}))
+
+    def record(self, url, body, content_type=None, encoding=None):
+        """Save a response body for a URL."""
+        name = hashlib.sha1(url.encode()).hexdigest()[:16] + '.body'
+        self.path.mkdir(parents=True, exist_ok=True)
+        data = body.encode(encoding or 'utf-8') if isinstance(body, str) else body
+        with self._lock:
+            (self.path / name).write_bytes(data)
+            self._manifest['responses'][url] = {
+                'file': name,
+                'content_type': content_type,
+                'encoding': encoding,
+            }
+            self._save_manifest()
+
+    def body(self, url):
+        """Return the recorded bytes for a URL, or None if not recorded."""
+        entry = self._entry(url)
+        if not entry:
+            self.missing.append(url)
+            logger.warning(f"No fixture recorded for {url}")
+            return None
+        return (self.path / entry['file']).read_bytes()
+
+    def text(self, url):
+        """Return the recorded body for a URL decoded as text."""
+        data = self.body(url)
+        if data is None:
+            return None
+        return data.decode(self._entry(url).get('encoding') or 'utf-8', errors='replace')
+
+    def response(self, url):
+        """Build a requests.Response from the recorded body, or None."""
+        import requests
+
+        data = self.body(url)
+        if data is None:
+            return None
+        entry = self._entry(url)
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = url
+        resp._content = data
+        resp.encoding = entry.get('encoding')
+        if entry.get('content_type'):
+            resp.headers['Content-Type'] = entry['content_type']
+        resp.from_cache = False
+        return resp
+
+
+@contextmanager
+def using_fixtures(path, mode):
+    """Route scraper traffic through a FixtureStore for the duration of the block.
+
+    The HTTP cache and Doc Films' series cache use a scratch directory for the
+    block, so recording or replaying never changes what the next build sees.
+    """
+    with tempfile.TemporaryDirectory(prefix='fixture_state.') as state_dir:
+        store = FixtureStore(path, mode, state_dir)
+        previous = utils.set_fixture_store(store)
+        try:
+            yield store
+        finally:
+            utils.set_fixture_store(previous)
+
+
+def recording(path):
+    """Record live responses into `path`."""
+    return using_fixtures(path, 'record')
+
+
+def replaying(path):
+    """Serve responses from `path` with no network access."""
+    return using_fixtures(path, 'replay')
@@ -0,0 +1,150 @@
+"""On-disk HTTP response cache with conditional GET revalidation."""
+import hashlib
+import threading
+import time
+from pathlib import Path
+from .utils import load_json, state_path, write_json_atomic
+
+CACHE_DIR = Path(__file__).parent.parent / 'data' / 'http_cache'
+
+# Total size of stored bodies before least-recently-used entries are evicted
+MAX_BYTES = 50 * 1024 * 1024
+
+
+class HTTPCache:
+    """Store response bodies with their ETag/Last-Modified validators.
+
+    Bodies live in one file per URL under `path`; an index.json maps each URL
+    to its validators, size and last-use time. When the total stored size
+    exceeds `max_bytes`, least recently used entries are evicted.
+    """
+
+    def __init__(self, path=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._index = load_json(self.index_file)
+
+    @property
+    def index_file(self):
+        return self.path / 'index.json'
+
+    def _save_index(self):
+        write_json_atomic(self.index_file, self._index)
+
+    def _body_file(self, url):
+        return self.path / (hashlib.sha1(url.encode()).hexdigest() + '.body')
+
+    def entry(self, url):
+        """Return the stored metadata for a URL, or None."""
+        with self._lock:
+            return self._index.get(url)
+
+    def conditional_headers(self, url):
+        """Return If-None-Match/If-Modified-Since headers for a cached URL."""
+        entry = self.entry(url)
+        if not entry or not self._body_file(url).exists():
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, resp):
+        """Count a full (200) response as a miss and save it if it carries validators."""
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            if not (etag or last_modified):
+                return
+            body = resp.content
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._body_file(url).write_bytes(body)
+            self._index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': resp.headers.get('Content-Type'),
+                'encoding': resp.encoding,
+                'size': len(body),
+                'last_used': time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+    def revalidated(self, url, resp):
+        """Turn a 304 response into a 200 carrying the stored body.
+
+        Returns None if the body is no longer on disk, after dropping the
+        entry so the next request for the URL is unconditional.
+        """
+        with self._lock:
+            entry = self._index.get(url)
+            body_file = self._body_file(url)
+            if not entry or not body_file.exists():
+                if self._index.pop(url, None) is not None:
+                    self._save_index()
+                return None
+            body = body_file.read_bytes()
+            entry['last_used'] = time.time()
+            for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified')):
+                if resp.headers.get(header):
+                    entry[key] = resp.headers[header]
+            self._save_index()
+            self.hits += 1
+
+        resp.status_code = 200
+        resp._content = body
+        resp.encoding = entry.get('encoding')
+        if entry.get('content_type'):
+            resp.headers['Content-Type'] = entry['content_type']
+        resp.from_cache = True
+        return resp
+
+    def stored_text(self, url):
+        """Return the stored body for a URL as text without asking the server, or None."""
+        with self._lock:
+            entry = self._index.get(url)
+            body_file = self._body_file(url)
+            if not entry or not body_file.exists():
+                return None
+            body = body_file.read_bytes()
+            entry['last_used'] = time.time()
+            self._save_index()
+            self.hits += 1
+        return body.decode(entry.get('encoding') or 'utf-8', errors='replace')
+
+    def _evict(self):
+        total = sum(e['size'] for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            self._body_file(url).unlink(missing_ok=True)
+            del self._index[url]
+            total -= entry['size']
+
+    def stats(self):
+        """Return hits (304s served from disk), misses (full responses) and current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._index),
+                    'bytes': sum(e['size'] for e in self._index.values())}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Return the process-wide HTTP cache (a scratch one while fixtures are in use)."""
+    global _cache
+    path = state_path(CACHE_DIR)
+    with _cache_lock:
+        if _cache is None or _cache.path != path:
+            _cache = HTTPCache(path)
+        return _cache
@@ -1,30 +1,76 @@
 """Fetch movie details from Letterboxd."""
-import requests
 from bs4 import BeautifulSoup
 import re
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from .utils import logger
+from .films import FilmIndex
+from .utils import RateLimiter, get_session, load_json, make_request, logger, write_json_atomic
 
 CACHE_FILE = Path(__file__).parent.parent / 'data' / 'letterboxd_cache.json'
 
-
-def load_cache():
-    """Load cached Letterboxd data."""
-    if CACHE_FILE.exists():
-        try:
-            with open(CACHE_FILE) as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
-
-
-def save_cache(cache):
-    """Save Letterboxd cache."""
-    CACHE_FILE.parent.mkdir(exist_ok=True)
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=2)
+LETTERBOXD_URL = 'https://letterboxd.com'
+
+# Defaults for enrich_movies_with_letterboxd
+MAX_WORKERS = 4
+REQUESTS_PER_SECOND = 4.0
+
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+
+
+class LetterboxdCache:
+    """In-memory view of the Letterboxd cache file.
+
+    The file is read once when the cache is created. New entries are kept in
+    memory and written back atomically on flush(), either explicitly or
+    automatically every `flush_every` writes.
+    """
+
+    def __init__(self, path=CACHE_FILE, flush_every=25):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._dirty = 0
+        self._lock = threading.RLock()
+        self._data = load_json(self.path)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Return (found, value) for a cache key and update hit/miss counters."""
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        """Store a value, flushing to disk every `flush_every` writes."""
+        with self._lock:
+            self._data[key] = value
+            self.writes += 1
+            self._dirty += 1
+            if self.flush_every and self._dirty >= self.flush_every:
+                self.flush()
+
+    def flush(self):
+        """Write the cache to disk via temp file + rename, if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            write_json_atomic(self.path, self._data, indent=2)
+            self._dirty = 0
+
+    def stats(self):
+        """Return hit/miss/write counters."""
+        return {'hits': self.hits, 'misses': self.misses, 'writes': self.writes, 'entries': len(self._data)}
 
 
 def clean_title(title):
@@ -70,40 +116,50 @@ def extract_year_from_page(soup):
     return None
 
 
-def try_fetch_url(url, headers):
+def try_fetch_url(url, session=None, rate_limiter=None):
     """Try to fetch a URL and return soup if successful."""
-    try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        if resp.status_code == 200:
-            return BeautifulSoup(resp.text, 'lxml'), url
-    except:
-        pass
+    resp = make_request(url, session=session, timeout=10, retries=1,
+                        rate_limiter=rate_limiter or _rate_limiter, quiet=True)
+    if resp is not None and resp.status_code == 200:
+        return BeautifulSoup(resp.text, 'lxml'), url
     return None, None
 
 
-def fetch_letterboxd_info(title, year=None):
-    """Fetch movie info from Letterboxd."""
-    cache = load_cache()
+def fetch_letterboxd_info(title, year=None, cache=None, session=None, rate_limiter=None):
+    """Fetch movie info from Letterboxd.
+
+    Pass a shared LetterboxdCache to batch cache writes across many lookups;
+    without one, the cache file is loaded and flushed for this call alone.
+    """
+    if cache is None:
+        cache = LetterboxdCache()
+        try:
+            return fetch_letterboxd_info(title, year, cache=cache, session=session, rate_limiter=rate_limiter)
+        finally:
+            cache.flush()
 
     cache_key = f"{title}|{year}" if year else title
-    if cache_key in cache:
-        return cache[cache_key]
+    found, cached = cache.get(cache_key)
+    if found:
+        return cached
 
     slug = title_to_slug(title)
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
+
+    def fetch(url):
+        return try_fetch_url(url, session=session, rate_limiter=rate_limiter)
 
     soup = None
     url = None
 
     # Strategy: Try with year first if available (more specific)
     if year:
-        url_with_year = f'https://letterboxd.com/film/{slug}-{year}/'
-        soup, url = try_fetch_url(url_with_year, headers)
+        url_with_year = f'{LETTERBOXD_URL}/film/{slug}-{year}/'
+        soup, url = fetch(url_with_year)
 
     # If year lookup failed, try without year
     if not soup:
-        url_no_year = f'https://letterboxd.com/film/{slug}/'
-        soup, url = try_fetch_url(url_no_year, headers)
+        url_no_year = f'{LETTERBOXD_URL}/film/{slug}/'
+        soup, url = fetch(url_no_year)
 
         # Verify the year matches if we got a result and have a target year
         if soup and year:
@@ -112,11 +168,11 @@ def fetch_letterboxd_info(title, year=None):
                 # Wrong year - try some variations
                 # Sometimes Letterboxd uses different slug formats
                 variations = [
-                    f'https://letterboxd.com/film/the-{slug}-{year}/',  # Add "the"
-                    f'https://letterboxd.com/film/{slug.replace("the-", "")}-{year}/',  # Remove "the"
+                    f'{LETTERBOXD_URL}/film/the-{slug}-{year}/',  # Add "the"
+                    f'{LETTERBOXD_URL}/film/{slug.replace("the-", "")}-{year}/',  # Remove "the"
                 ]
                 for var_url in variations:
-                    var_soup, var_url_result = try_fetch_url(var_url, headers)
+                    var_soup, var_url_result = fetch(var_url)
                     if var_soup:
                         var_year = extract_year_from_page(var_soup)
                         if var_year == year:
@@ -128,13 +184,11 @@ def fetch_letterboxd_info(title, year=None):
                     page_year = extract_year_from_page(soup)
                     if page_year and page_year != year:
                         logger.warning(f"Letterboxd year mismatch for {title}: wanted {year}, got {page_year}")
-                        cache[cache_key] = None
-                        save_cache(cache)
+                        cache.set(cache_key, None)
                         return None
 
     if not soup:
-        cache[cache_key] = None
-        save_cache(cache)
+        cache.set(cache_key, None)
         return None
 
     info = {
@@ -182,35 +236,60 @@ def fetch_letterboxd_info(title, year=None):
         if img and img.get('src'):
             info['poster'] = img.get('src')
 
-    cache[cache_key] = info
-    save_cache(cache)
+    cache.set(cache_key, info)
     return info
 
 
-def enrich_movies_with_letterboxd(movies):
-    """Add Letterboxd info to movies list."""
-    # Get unique titles with years
-    unique_titles = {}
+def enrich_movies_with_letterboxd(movies, max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND):
+    """Add Letterboxd info to the films of a list of Screenings.
+
+    Unique films are looked up on up to `max_workers` threads sharing one
+    keep-alive session, with requests to letterboxd.com capped at
+    `requests_per_second`. Results are keyed by film, so the output does not
+    depend on the order lookups finish in. The info is set once on each
+    shared Film rather than copied onto every screening.
+
+    Listings are grouped through the persistent FilmIndex first, so
+    "QUEEN KELLY" and "Queen Kelly (1929)" at two theaters are looked up
+    once, as "Queen Kelly" 1929.
+    """
+    films_by_listing = {}
     for movie in movies:
-        key = f"{movie['title']}|{movie.get('year', '')}"
-        if key not in unique_titles:
-            unique_titles[key] = (movie['title'], movie.get('year'))
+        films_by_listing.setdefault((movie.film.title, movie.film.year), []).append(movie.film)
+
+    # One lookup per distinct film, under its preferred title and year
+    film_index = FilmIndex()
+    unique_titles = {}
+    for title, year, listings in film_index.group(films_by_listing):
+        group = unique_titles.setdefault((title, year), [])
+        group.extend(film for listing in listings for film in films_by_listing[listing])
+    film_index.flush()
 
     # Fetch info for each unique title
-    logger.info(f"Fetching Letterboxd info for {len(unique_titles)} unique films...")
-    title_info = {}
-    for key, (title, year) in unique_titles.items():
-        info = fetch_letterboxd_info(title, year)
-        if info:
-            title_info[key] = info
+    logger.info(f"Fetching Letterboxd info for {len(unique_titles)} unique films "
+                f"({len(films_by_listing)} listings)...")
+    cache = LetterboxdCache()
+    session = get_session()
+    rate_limiter = RateLimiter(requests_per_second)
 
-    logger.info(f"Found Letterboxd data for {len(title_info)} films")
+    def lookup(item):
+        title, year = item
+        return fetch_letterboxd_info(title, year, cache=cache, session=session, rate_limiter=rate_limiter)
 
-    # Add info to movies
-    for movie in movies:
-        key = f"{movie['title']}|{movie.get('year', '')}"
-        info = title_info.get(key)
-        if info:
-            movie['letterboxd'] = info
+    found = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            results = pool.map(lookup, unique_titles)
+            for films, info in zip(unique_titles.values(), results):
+                if info:
+                    found += 1
+                    for film in films:
+                        film.letterboxd = info
+    finally:
+        cache.flush()
+
+    logger.info(f"Found Letterboxd data for {found} films")
+    stats = cache.stats()
+    logger.info(f"Letterboxd cache: {stats['hits']} hits, {stats['misses']} misses, {stats['writes']} writes")
 
     return movies
@@ -1,8 +1,8 @@
 """Scraper for Logan Theatre using BigScreen.com as data source."""
-from bs4 import BeautifulSoup
-from .utils import parse_time, logger
-import requests
+from bs4 import SoupStrainer
+from .utils import make_request, make_soup, logger
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 
@@ -14,119 +14,155 @@ THEATER_INFO = {
 
 BIGSCREEN_URL = 'https://www.bigscreen.com/Marquee.php?theater=932&view=sched'
 
+# Number of days fetched, starting today
+DAYS = 7
 
-def scrape_logan():
-    """Scrape Logan Theatre schedule from BigScreen.com."""
-    movies = []
+# Only the schedule rows (graybar_0 / graybar_1) are parsed
+ROW_STRAINER = SoupStrainer('tr', class_=re.compile(r'graybar_'))
 
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        }
 
-        # Scrape today and next 6 days
-        for day_offset in range(7):
-            date = datetime.now() + timedelta(days=day_offset)
-            date_str = date.strftime('%Y-%m-%d')
-
-            url = f'{BIGSCREEN_URL}&showdate={date_str}'
-            resp = requests.get(url, headers=headers, timeout=30)
-
-            if resp.status_code != 200:
-                logger.error(f"Logan Theatre: Got status code {resp.status_code} for {date_str}")
-                continue
-
-            soup = BeautifulSoup(resp.text, 'lxml')
-
-            # Find all rows with movie data (graybar_0 or graybar_1)
-            rows = soup.find_all('tr', class_=re.compile(r'graybar_'))
-
-            for row in rows:
-                # Get title from movieNameList link
-                title_elem = row.find('a', class_='movieNameList')
-                if not title_elem:
-                    continue
-
-                title = title_elem.get_text().strip()
-                if not title:
-                    continue
-
-                # Get showtimes from col_showtimes
-                showtime_td = row.find('td', class_='col_showtimes')
-                if not showtime_td:
-                    continue
-
-                # Extract times (format: "4:30, 6:45, 9:00")
-                showtime_text = showtime_td.get_text()
-                # Get just the times part (before any <br> or showcomment)
-                times_part = showtime_text.split('\n')[0].strip()
-
-                times = []
-                for time_match in re.findall(r'(\d{1,2}:\d{2})', times_part):
-                    # Convert to 12-hour format with AM/PM
-                    hour, minute = map(int, time_match.split(':'))
-                    if hour < 12:
-                        # Morning shows before noon (rare)
-                        if hour == 0:
-                            time_str = f"12:{minute:02d} AM"
-                        else:
-                            time_str = f"{hour}:{minute:02d} AM"
-                    elif hour == 12:
-                        time_str = f"12:{minute:02d} PM"
-                    else:
-                        time_str = f"{hour}:{minute:02d} PM"
-
-                    # BigScreen uses 24h times implicitly based on typical movie schedules
-                    # Most showtimes are PM (afternoon/evening)
-                    # Re-parse: assume times like 4:30, 6:45 are PM
-                    if hour < 10:
-                        # 4:30 means 4:30 PM
-                        time_str = f"{hour}:{minute:02d} PM"
-                    elif hour >= 10 and hour <= 11:
-                        # 10:00, 11:00 - late night, could be AM (midnight show) or PM
-                        # Check context - if it's the only time or very late, it's PM
-                        time_str = f"{hour}:{minute:02d} PM"
-
-                    if time_str not in times:
-                        times.append(time_str)
-
-                if not times:
-                    continue
-
-                # Check if already have this movie for this date
-                existing = next(
-                    (m for m in movies if m['title'] == title and m['date'] == date_str),
-                    None
-                )
-                if existing:
-                    # Add any new times
-                    for t in times:
-                        if t not in existing['times']:
-                            existing['times'].append(t)
-                    continue
-
-                movies.append({
-                    'title': title,
-                    'theater': THEATER_INFO['name'],
-                    'theater_url': THEATER_INFO['url'],
-                    'address': THEATER_INFO['address'],
-                    'date': date_str,
-                    'times': times,
-                    'format': None,
-                    'director': None,
-                    'year': None,
-                    'ticket_url': f"{THEATER_INFO['url']}/?p=showtimes"
-                })
-
-        logger.info(f"Logan Theatre: Found {len(movies)} screenings")
+def day_url(date_str):
+    """BigScreen schedule URL for one day."""
+    return f'{BIGSCREEN_URL}&showdate={date_str}'
+
 
+def fetch_day(date_str):
+    """Fetch one day's schedule page, returning its HTML or None."""
+    try:
+        resp = make_request(day_url(date_str))
     except Exception as e:
-        logger.error(f"Failed to scrape Logan Theatre: {e}")
+        logger.error(f"Logan Theatre: Error fetching schedule for {date_str}: {e}")
+        return None
+    if not resp:
+        logger.error(f"Logan Theatre: Failed to fetch schedule for {date_str}")
+        return None
+    return resp.text
+
+
+def fetch():
+    """Fetch the schedule pages for today and the next 6 days. Returns {url: html}.
+
+    The days are fetched concurrently over the shared session; a day that
+    fails is logged and left out without affecting the others.
+    """
+    # Scrape today and next 6 days
+    dates = [(datetime.now() + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(DAYS)]
+
+    with ThreadPoolExecutor(max_workers=DAYS) as pool:
+        pages = list(pool.map(fetch_day, dates))
+
+    return {day_url(date_str): html for date_str, html in zip(dates, pages) if html}
 
+
+def parse(documents):
+    """Parse BigScreen day pages into screenings, merging repeat rows per day."""
+    movies = []
+    index = {}
+
+    for url, html in documents.items():
+        date_str = re.search(r'showdate=(\d{4}-\d{2}-\d{2})', url).group(1)
+        try:
+            parse_day(html, date_str, movies, index)
+        except Exception as e:
+            logger.error(f"Logan Theatre: Failed to parse schedule for {date_str}: {e}")
+
+    logger.info(f"Logan Theatre: Found {len(movies)} screenings")
     return movies
 
 
+def parse_day(html, date_str, movies, index):
+    """Add one day's screenings to `movies`.
+
+    `index` maps (title, date) to the movie already in `movies`, so repeat
+    rows for the same film just add their times.
+    """
+    soup = make_soup(html, ROW_STRAINER)
+
+    # Find all rows with movie data (graybar_0 or graybar_1)
+    rows = soup.find_all('tr', class_=re.compile(r'graybar_'))
+
+    for row in rows:
+        # Get title from movieNameList link
+        title_elem = row.find('a', class_='movieNameList')
+        if not title_elem:
+            continue
+
+        title = title_elem.get_text().strip()
+        if not title:
+            continue
+
+        # Get showtimes from col_showtimes
+        showtime_td = row.find('td', class_='col_showtimes')
+        if not showtime_td:
+            continue
+
+        # Extract times (format: "4:30, 6:45, 9:00")
+        showtime_text = showtime_td.get_text()
+        # Get just the times part (before any <br> or showcomment)
+        times_part = showtime_text.split('\n')[0].strip()
+
+        times = []
+        for time_match in re.findall(r'(\d{1,2}:\d{2})', times_part):
+            # Convert to 12-hour format with AM/PM
+            hour, minute = map(int, time_match.split(':'))
+            if hour < 12:
+                # Morning shows before noon (rare)
+                if hour == 0:
+                    time_str = f"12:{minute:02d} AM"
+                else:
+                    time_str = f"{hour}:{minute:02d} AM"
+            elif hour == 12:
+                time_str = f"12:{minute:02d} PM"
+            else:
+                time_str = f"{hour}:{minute:02d} PM"
+
+            # BigScreen uses 24h times implicitly based on typical movie schedules
+            # Most showtimes are PM (afternoon/evening)
+            # Re-parse: assume times like 4:30, 6:45 are PM
+            if hour < 10:
+                # 4:30 means 4:30 PM
+                time_str = f"{hour}:{minute:02d} PM"
+            elif hour >= 10 and hour <= 11:
+                # 10:00, 11:00 - late night, could be AM (midnight show) or PM
+                # Check context - if it's the only time or very late, it's PM
+                time_str = f"{hour}:{minute:02d} PM"
+
+            if time_str not in times:
+                times.append(time_str)
+
+        if not times:
+            continue
+
+        # Check if already have this movie for this date
+        existing = index.get((title, date_str))
+        if existing:
+            # Add any new times
+            for t in times:
+                if t not in existing['times']:
+                    existing['times'].append(t)
+            continue
+
+        movie = {
+            'title': title,
+            'theater': THEATER_INFO['name'],
+            'theater_url': THEATER_INFO['url'],
+            'address': THEATER_INFO['address'],
+            'date': date_str,
+            'times': times,
+            'format': None,
+            'director': None,
+            'year': None,
+            'ticket_url': f"{THEATER_INFO['url']}/?p=showtimes"
+        }
+        index[(title, date_str)] = movie
+        movies.append(movie)
+
+
+def scrape_logan():
+    """Scrape Logan Theatre schedule from BigScreen.com."""
+    return parse(fetch())
+
+
 if __name__ == '__main__':
     results = scrape_logan()
     for m in results:
@@ -0,0 +1,209 @@
+"""Screening records for the build pipeline.
+
+Scrapers return plain dicts in the schema documented in the README. The build
+turns them into Screening objects once at ingest; each Screening references a
+shared Theater and Film, so theater details and Letterboxd data are stored
+once instead of being copied onto every showtime.
+"""
+from datetime import datetime
+from .utils import format_minutes, logger, time_to_minutes
+
+
+class Theater:
+    """A venue, shared by all of its screenings."""
+
+    __slots__ = ('name', 'url', 'address')
+
+    def __init__(self, name, url=None, address=None):
+        self.name = name
+        self.url = url
+        self.address = address
+
+    def __repr__(self):
+        return f"Theater({self.name!r})"
+
+
+class Film:
+    """A film as listed by a theater, shared by all of its screenings."""
+
+    __slots__ = ('title', 'year', 'director', 'letterboxd')
+
+    def __init__(self, title, year=None, director=None, letterboxd=None):
+        self.title = title
+        self.year = year
+        self.director = director
+        self.letterboxd = letterboxd
+
+    def __repr__(self):
+        return f"Film({self.title!r}, {self.year!r})"
+
+
+class Screening:
+    """One film at one theater on one day, with its showtimes.
+
+    `times` holds display strings ("7:00 PM") ordered by time and `minutes`
+    the matching minutes since midnight (None for entries such as
+    "See website"), so sorting never re-parses strings.
+    """
+
+    __slots__ = ('film', 'theater', 'day', 'times', 'minutes', 'format', 'ticket_url')
+
+    def __init__(self, film, theater, day, times=(), minutes=(), format=None, ticket_url=None):
+        self.film = film
+        self.theater = theater
+        self.day = day
+        self.times = tuple(times)
+        self.minutes = tuple(minutes)
+        self.format = format
+        self.ticket_url = ticket_url
+
+    def __repr__(self):
+        return f"Screening({self.film.title!r}, {self.theater.name!r}, {self.date})"
+
+    @property
+    def title(self):
+        return self.film.title
+
+    @property
+    def date(self):
+        """The day as 'YYYY-MM-DD'."""
+        return self.day.isoformat()
+
+    def to_dict(self, letterboxd=True):
+        """Flatten to the README schema (plus 'letterboxd' once enriched)."""
+        data = {
+            'title': self.film.title,
+            'theater': self.theater.name,
+            'theater_url': self.theater.url,
+            'address': self.theater.address,
+            'date': self.date,
+            'times': list(self.times),
+            'format': self.format,
+            'director': self.film.director,
+            'year': self.film.year,
+            'ticket_url': self.ticket_url,
+        }
+        if letterboxd and self.film.letterboxd:
+            data['letterboxd'] = self.film.letterboxd
+        return data
+
+    @classmethod
+    def from_dict(cls, data, catalog=None):
+        """Build a Screening from a README-schema dict.
+
+        Showtimes are rewritten in one display form and ordered by time.
+        Theaters and films come from `catalog`, so screenings built with the
+        same catalog share them. Raises ValueError if the date can't be read.
+        """
+        catalog = catalog if catalog is not None else Catalog()
+        try:
+            day = datetime.strptime(data['date'], '%Y-%m-%d').date()
+        except (KeyError, ValueError, TypeError) as e:
+            raise ValueError(f"Bad screening date in {data.get('title')!r}: {e}")
+
+        showtimes = []
+        for time_str in data.get('times') or []:
+            minutes = time_to_minutes(time_str)
+            display = format_minutes(minutes) if minutes is not None else time_str
+            if (minutes, display) not in showtimes:
+                showtimes.append((minutes, display))
+        # Known times in order; unparseable ones ("See website") keep their place after them
+        showtimes.sort(key=lambda t: (t[0] is None, t[0] or 0))
+
+        film = catalog.film(data['title'], data.get('year'), data.get('director'))
+        if data.get('letterboxd') and not film.letterboxd:
+            film.letterboxd = data['letterboxd']
+        return cls(
+            film=film,
+            theater=catalog.theater(data['theater'], data.get('theater_url'), data.get('address')),
+            day=day,
+            times=[display for _, display in showtimes],
+            minutes=[minutes for minutes, _ in showtimes],
+            format=data.get('format'),
+            ticket_url=data.get('ticket_url'),
+        )
+
+
+class Catalog:
+    """Hands out one Theater per venue and one Film per listing."""
+
+    def __init__(self):
+        self.theaters = {}
+        self.films = {}
+
+    def theater(self, name, url=None, address=None):
+        theater = self.theaters.get(name)
+        if theater is None:
+            theater = self.theaters[name] = Theater(name, url, address)
+        return theater
+
+    def film(self, title, year=None, director=None):
+        key = (title, year, director)
+        film = self.films.get(key)
+        if film is None:
+            film = self.films[key] = Film(title, year, director)
+        return film
+
+    def screenings(self, records):
+        """Convert scraped dicts to Screenings, dropping ones with unreadable dates."""
+        screenings = []
+        for record in records:
+            try:
+                screenings.append(Screening.from_dict(record, self))
+            except ValueError as e:
+                logger.warning(str(e))
+        return screenings
+
+
+def to_tables(screenings):
+    """Normalize screenings into theater, film and screening tables.
+
+    Each theater and film appears once; screenings refer to them by their
+    position (id) in the `theaters` and `films` lists. Empty fields are left
+    out. from_tables() reverses this.
+    """
+    theater_ids = {}
+    film_ids = {}
+    theaters = []
+    films = []
+    rows = []
+    for screening in screenings:
+        theater, film = screening.theater, screening.film
+        if theater not in theater_ids:
+            theater_ids[theater] = len(theaters)
+            theaters.append(_compact({'name': theater.name, 'url': theater.url, 'address': theater.address}))
+        if film not in film_ids:
+            film_ids[film] = len(films)
+            films.append(_compact({'title': film.title, 'year': film.year, 'director': film.director,
+                                   'letterboxd': film.letterboxd}))
+        rows.append(_compact({
+            'film': film_ids[film],
+            'theater': theater_ids[theater],
+            'date': screening.date,
+            'times': list(screening.times),
+            'format': screening.format,
+            'ticket_url': screening.ticket_url,
+        }))
+    return {'theaters': theaters, 'films': films, 'screenings': rows}
+
+
+def from_tables(tables):
+    """Rebuild Screenings (sharing Theater and Film objects) from to_tables() output."""
+    theaters = [Theater(t['name'], t.get('url'), t.get('address')) for t in tables['theaters']]
+    films = [Film(f['title'], f.get('year'), f.get('director'), f.get('letterboxd')) for f in tables['films']]
+    return [
+        Screening(
+            film=films[row['film']],
+            theater=theaters[row['theater']],
+            day=datetime.strptime(row['date'], '%Y-%m-%d').date(),
+            times=row.get('times', ()),
+            minutes=[time_to_minutes(t) for t in row.get('times', ())],
+            format=row.get('format'),
+            ticket_url=row.get('ticket_url'),
+        )
+        for row in tables['screenings']
+    ]
+
+
+def _compact(record):
+    return {k: v for k, v in record.items() if v is not None and v != []}
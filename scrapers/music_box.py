@@ -1,6 +1,6 @@
 """Scraper for Music Box Theatre."""
-from bs4 import BeautifulSoup
-from .utils import make_request, parse_date, clean_text, logger
+from .http_cache import get_http_cache
+from .utils import make_request, make_soup, parse_date, clean_text, logger
 import re
 from datetime import datetime
 
@@ -12,17 +12,30 @@ THEATER_INFO = {
 }
 
 
-def scrape_music_box():
-    """Scrape Music Box Theatre schedule."""
-    movies = []
-    base_url = 'https://musicboxtheatre.com'
+BASE_URL = 'https://musicboxtheatre.com'
+CALENDAR_URL = f'{BASE_URL}/calendar'
 
-    resp = make_request(f'{base_url}/calendar')
+
+def fetch():
+    """Fetch the calendar page. Returns {url: html}."""
+    resp = make_request(CALENDAR_URL, cache=get_http_cache())
     if not resp:
         logger.error("Failed to fetch Music Box Theatre")
+        return {}
+    return {CALENDAR_URL: resp.text}
+
+
+def parse(documents):
+    """Parse the calendar page into screenings."""
+    movies = []
+    base_url = BASE_URL
+
+    html = documents.get(CALENDAR_URL)
+    if not html:
         return movies
 
-    soup = BeautifulSoup(resp.text, 'lxml')
+    # Full tree: each showtime block is matched back to its enclosing film card
+    soup = make_soup(html)
     current_year = datetime.now().year
 
     # Find all showtime blocks
@@ -93,6 +106,11 @@ def scrape_music_box():
     return movies
 
 
+def scrape_music_box():
+    """Scrape Music Box Theatre schedule."""
+    return parse(fetch())
+
+
 if __name__ == '__main__':
     results = scrape_music_box()
     for m in results:
@@ -1,6 +1,12 @@
-"""Scraper for Gene Siskel Film Center using Playwright."""
-from .utils import clean_text, logger
-from datetime import datetime
+"""Scraper for Gene Siskel Film Center: Playwright, or plain HTTP once the calendar's data request is known."""
+from bs4 import SoupStrainer
+from .http_cache import get_http_cache
+from .utils import (clean_text, get_fixture_store, load_json, make_request, make_soup, logger, state_path,
+                    write_json_atomic)
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+import json
 import re
 
 THEATER_INFO = {
@@ -9,42 +15,338 @@ THEATER_INFO = {
     'address': '164 N State St'
 }
 
+CALENDAR_URL = f"{THEATER_INFO['url']}/playing-this-month"
 
-def scrape_siskel():
-    """Scrape Gene Siskel Film Center schedule using Playwright."""
-    movies = []
+# Only the calendar grid is parsed out of the rendered page
+CALENDAR_STRAINER = SoupStrainer(class_='view-monthly-calendar')
+NAV_STRAINER = SoupStrainer('a', href=True)
 
-    try:
+
+# A screening link inside the calendar grid: the container is in the page
+# before the JavaScript fills it in, so wait for what calendar_has_screenings() checks
+CALENDAR_SELECTOR = '.view-monthly-calendar .calendar-view-day__rows a'
+
+# Resource types and third-party hosts that play no part in rendering the calendar
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+BLOCKED_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'facebook.net',
+    'facebook.com',
+    'hotjar.com',
+    'newrelic.com',
+    'nr-data.net',
+    'clarity.ms',
+)
+
+# Days from today the site shows; decides whether next month's calendar is needed
+WINDOW_DAYS = 7
+
+# 'auto' tries plain HTTP and falls back to the browser; 'http' or 'browser' force one path
+FETCH_MODE = 'auto'
+
+# The request each calendar page's JavaScript fills the grid from, by page URL,
+# with the month it was seen for, from Playwright renders. Later runs in the
+# same month fetch it over plain HTTP.
+ENDPOINTS_FILE = Path(__file__).parent.parent / 'data' / 'siskel_endpoints.json'
+
+# Sent with endpoint requests, as the page's own script does
+XHR_HEADERS = {'X-Requested-With': 'XMLHttpRequest'}
+
+# Milliseconds
+NAVIGATION_TIMEOUT = 30000
+RENDER_TIMEOUT = 15000
+
+
+def should_block(resource_type, url):
+    """Whether a browser request can be aborted without affecting the calendar."""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlparse(url).hostname or ''
+    return any(host == blocked or host.endswith('.' + blocked) for blocked in BLOCKED_HOSTS)
+
+
+class SiskelBrowser:
+    """Headless Chromium session that can render several pages.
+
+    Use as a context manager. Chromium is launched on the first render() call
+    (so a fetch that never needs it never pays for it), and one browser and
+    context (with request blocking installed) are shared by every later call.
+    Playwright's sync API ties these objects to the thread that created them.
+    After each render, `endpoints` maps the page URL to the data request its
+    calendar grid came from (None if none was found).
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self.endpoints = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        """Launch Chromium and set up the blocking context, if not already running."""
+        if self.context is not None:
+            return
         from playwright.sync_api import sync_playwright
-    except ImportError:
-        logger.warning("Playwright not installed - skipping Siskel")
-        return movies
 
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        self._playwright = sync_playwright().start()
+        try:
+            self.browser = self._playwright.chromium.launch(headless=True)
+            self.context = self.browser.new_context()
+            self.context.route('**/*', self._route)
+        except Exception:
+            self.close()
+            raise
 
-            # Go to the calendar page
-            page.goto(f"{THEATER_INFO['url']}/playing-this-month", timeout=30000)
+    def close(self):
+        """Shut down the browser if it was started."""
+        if self.browser is not None:
+            self.browser.close()
+        if self._playwright is not None:
+            self._playwright.stop()
+        self._playwright = self.browser = self.context = None
 
-            # Wait for content to load
-            page.wait_for_timeout(5000)
+    @staticmethod
+    def _route(route):
+        request = route.request
+        if should_block(request.resource_type, request.url):
+            route.abort()
+        else:
+            route.continue_()
 
-            # Get the page content
-            content = page.content()
-            browser.close()
+    def render(self, url):
+        """Load `url` and return its HTML once the calendar has rendered."""
+        self.start()
+        page = self.context.new_page()
+        data_responses = []
+
+        def collect(response):
+            request = response.request
+            if request.resource_type in ('xhr', 'fetch') and request.method == 'GET':
+                data_responses.append(response)
+
+        page.on('response', collect)
+        try:
+            page.goto(url, timeout=NAVIGATION_TIMEOUT, wait_until='domcontentloaded')
+            try:
+                page.wait_for_selector(CALENDAR_SELECTOR, timeout=RENDER_TIMEOUT)
+            except Exception:
+                # No calendar yet: settle for whatever is there once the network is quiet
+                logger.warning("Siskel: calendar screenings did not appear, waiting for network idle")
+                page.wait_for_load_state('networkidle', timeout=RENDER_TIMEOUT)
+            self.endpoints[url] = self._find_endpoint(data_responses)
+            return page.content()
+        finally:
+            page.close()
 
+    @staticmethod
+    def _find_endpoint(responses):
+        for response in responses:
+            try:
+                if response.ok and calendar_fragment(response.text()):
+                    return response.url
+            except Exception:
+                continue
+        return None
+
+
+def render_calendar(calendar_url, browser=None):
+    """Render the JS calendar page and return its HTML, or None on failure.
+
+    Pass an open SiskelBrowser to reuse it; otherwise one is started for this call.
+    """
+    try:
+        if browser is not None:
+            return browser.render(calendar_url)
+        with SiskelBrowser() as browser:
+            return browser.render(calendar_url)
+    except ImportError:
+        logger.warning("Playwright not installed - skipping Siskel")
     except Exception as e:
         logger.error(f"Playwright error for Siskel: {e}")
-        return movies
+    return None
+
+
+def calendar_has_screenings(html):
+    """Whether the HTML already contains a filled-in calendar grid."""
+    soup = make_soup(html, CALENDAR_STRAINER)
+    calendar = soup.find(class_='view-monthly-calendar')
+    if not calendar:
+        return False
+    return any(rows.find('a') for rows in calendar.find_all(class_='calendar-view-day__rows'))
+
+
+def calendar_fragment(body):
+    """The filled-in calendar HTML in a data response, or None.
+
+    Drupal's views AJAX answers with a JSON list of commands whose 'data'
+    fields carry HTML; other endpoints return the HTML fragment itself.
+    """
+    text = body.strip()
+    if text.startswith('['):
+        try:
+            commands = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(commands, list):
+            return None
+        text = ''.join(c['data'] for c in commands if isinstance(c, dict) and isinstance(c.get('data'), str))
+    return text if calendar_has_screenings(text) else None
+
+
+def load_endpoints():
+    """Calendar data requests seen in earlier renders: {page URL: {'url', 'month'}}."""
+    return load_json(state_path(ENDPOINTS_FILE))
+
+
+def save_endpoints(found):
+    """Record this run's renders: set entries they found a request for, drop the rest."""
+    endpoints = load_endpoints()
+    for page_url, entry in found.items():
+        if entry:
+            endpoints[page_url] = entry
+        else:
+            endpoints.pop(page_url, None)
+    write_json_atomic(state_path(ENDPOINTS_FILE), endpoints, indent=2)
+
+
+def fetch_calendar_http(calendar_url, month, endpoints):
+    """Fetch the calendar's grid from its data request, without a browser.
+
+    Returns None unless a render has seen the request for `calendar_url` in
+    `month` ('YYYY-MM'; a month-relative page URL serves a new month on the
+    1st) and its response has calendar entries.
+    """
+    entry = endpoints.get(calendar_url)
+    if not entry or entry.get('month') != month:
+        return None
+    resp = make_request(entry['url'], headers=XHR_HEADERS, cache=get_http_cache())
+    return calendar_fragment(resp.text) if resp else None
+
+
+def fetch_calendar_browser(calendar_url, browser=None):
+    """Render the calendar in Playwright (or read it from a replay fixture)."""
+    store = get_fixture_store()
+    if store is not None and store.mode == 'replay':
+        return store.text(calendar_url)
+    content = render_calendar(calendar_url, browser)
+    if content is not None and store is not None:
+        store.record(calendar_url, content, 'text/html; charset=utf-8', 'utf-8')
+    return content
+
+
+def months_in_window(today, days=WINDOW_DAYS):
+    """(year, month) pairs covered by today through `days` days later."""
+    months = []
+    for offset in range(days + 1):
+        day = today + timedelta(days=offset)
+        if (day.year, day.month) not in months:
+            months.append((day.year, day.month))
+    return months
+
+
+def following_month(year, month):
+    """The (year, month) after the given one, rolling over in December."""
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def next_month_url(html, page_url):
+    """URL of the calendar's "next month" link, or None."""
+    soup = make_soup(html, NAV_STRAINER)
+    for link in soup.find_all('a', href=True):
+        if 'next month' in link.get_text(' ', strip=True).lower():
+            return urljoin(page_url, link['href'])
+    return None
+
+
+def fetch_month(url, month, mode, browser, endpoints):
+    """Fetch one calendar month by the configured path, logging which was used."""
+    if mode in ('auto', 'http'):
+        content = fetch_calendar_http(url, month, endpoints)
+        if content:
+            logger.info(f"Gene Siskel: fetched {url} over plain HTTP from {endpoints[url]['url']} (no browser)")
+            return content
+        if mode == 'http':
+            logger.warning(f"Gene Siskel: {url} not available over plain HTTP")
+            return None
+        logger.info(f"Gene Siskel: no working data request known for {url} in {month}, using Playwright")
+
+    content = fetch_calendar_browser(url, browser)
+    if content:
+        logger.info(f"Gene Siskel: fetched {url} with Playwright")
+    return content
 
-    # Parse the rendered HTML
-    from bs4 import BeautifulSoup
-    soup = BeautifulSoup(content, 'lxml')
 
-    current_year = datetime.now().year
-    current_month = datetime.now().month
+def fetch(mode=None):
+    """Fetch every calendar month the week window touches. Returns {url: html}.
+
+    The current month always comes first; the next month is fetched (by
+    following the calendar's own "next month" link) only when the window runs
+    past the end of this month. The page itself arrives with an empty grid
+    that its JavaScript fills from a separate request. Playwright renders
+    record that request in ENDPOINTS_FILE, and in 'auto' mode later runs
+    fetch it over plain HTTP, starting Chromium (once) only for a month with
+    no known request or an empty answer.
+    """
+    mode = mode or FETCH_MODE
+    months = months_in_window(datetime.now().date())
+    endpoints = load_endpoints()
+    documents = {}
+
+    found = {}
+
+    with SiskelBrowser() as browser:
+        url = CALENDAR_URL
+        while url:
+            month = '%04d-%02d' % months[len(documents)]
+            content = fetch_month(url, month, mode, browser, endpoints)
+            if url in browser.endpoints:
+                endpoint = browser.endpoints.pop(url)
+                found[url] = {'url': endpoint, 'month': month} if endpoint else None
+            if not content:
+                break
+            documents[url] = content
+            if len(documents) == len(months):
+                break
+            url = next_month_url(content, url)
+            if not url:
+                logger.warning("Gene Siskel: no next month link; later dates in the week will be missing")
+        if found:
+            save_endpoints(found)
+
+    return documents
+
+
+def parse(documents):
+    """Parse rendered monthly calendars into screenings.
+
+    `documents` holds consecutive months in order, starting with the current
+    one, as returned by fetch().
+    """
+    movies = []
+    year, month = datetime.now().year, datetime.now().month
+
+    for content in documents.values():
+        movies.extend(parse_month(content, year, month))
+        year, month = following_month(year, month)
+
+    logger.info(f"Gene Siskel: Found {len(movies)} screenings")
+    return movies
+
+
+def parse_month(content, current_year, current_month):
+    """Parse one rendered month of the calendar into screenings."""
+    movies = []
+
+    # Parse the rendered HTML
+    soup = make_soup(content, CALENDAR_STRAINER)
 
     # Find the calendar view
     calendar = soup.find(class_='view-monthly-calendar')
@@ -112,7 +414,7 @@ def scrape_siskel():
             # Build ticket URL
             ticket_url = f"{THEATER_INFO['url']}{href}" if href.startswith('/') else href
             if not ticket_url:
-                ticket_url = f"{THEATER_INFO['url']}/playing-this-month"
+                ticket_url = CALENDAR_URL
 
             movies.append({
                 'title': title,
@@ -127,10 +429,14 @@ def scrape_siskel():
                 'ticket_url': ticket_url
             })
 
-    logger.info(f"Gene Siskel: Found {len(movies)} screenings")
     return movies
 
 
+def scrape_siskel():
+    """Scrape Gene Siskel Film Center schedule."""
+    return parse(fetch())
+
+
 if __name__ == '__main__':
     results = scrape_siskel()
     for m in results:
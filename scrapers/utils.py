@@ -1,6 +1,15 @@
 """Shared utilities for scrapers."""
+import json
+import os
+import random
 import re
+import tempfile
+import threading
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
 from dateutil import parser as date_parser
 import logging
 
@@ -8,6 +17,36 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def load_json(path):
+    """Load a JSON state file, or {} if it is missing or unreadable."""
+    path = Path(path)
+    if path.exists():
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Could not read {path}, starting empty")
+    return {}
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Write JSON to `path` via a temp file in the same directory + rename.
+
+    Readers, including a build killed halfway, see either the old file or
+    the new one, never a partial write. `dump_kwargs` go to json.dump.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.stem}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def get_week_dates():
     """Get dates for the current week (Mon-Sun)."""
     today = datetime.now()
@@ -16,31 +55,146 @@ def get_week_dates():
     return [(monday + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
 
 
-def parse_date(date_str, year=None):
-    """Parse various date formats into YYYY-MM-DD."""
-    if not date_str:
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('january', 'jan'), ('february', 'feb'), ('march', 'mar'), ('april', 'apr'),
+        ('may',), ('june', 'jun'), ('july', 'jul'), ('august', 'aug'),
+        ('september', 'sep', 'sept'), ('october', 'oct'), ('november', 'nov'), ('december', 'dec'),
+    ], start=1)
+    for name in names
+}
+WEEKDAYS = {
+    'monday', 'mon', 'tuesday', 'tue', 'tues', 'wednesday', 'wed', 'thursday', 'thu', 'thur',
+    'thurs', 'friday', 'fri', 'saturday', 'sat', 'sunday', 'sun',
+}
+
+# "Friday, February 13", "Sat, Feb 7", "Feb. 7", "February 7 2026"
+DATE_PATTERN = re.compile(
+    r'\s*(?:(?P<weekday>[A-Za-z]+)\.?,?\s+)?(?P<month>[A-Za-z]+)\.?\s+(?P<day>\d{1,2})'
+    r'(?:st|nd|rd|th)?,?(?:\s+(?P<year>\d{4}))?\s*'
+)
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})\s*(AM|PM)')
+TIME_HOUR_ONLY = re.compile(r'(\d{1,2})(AM|PM)')
+
+# Distinct date/time strings remembered by parse_date/parse_time
+PARSE_CACHE_SIZE = 4096
+
+
+def _fast_parse_date(date_str, year):
+    """Parse the known month/day shapes without dateutil; None if not recognized."""
+    match = DATE_PATTERN.fullmatch(date_str)
+    if not match:
+        return None
+    weekday = match.group('weekday')
+    if weekday and weekday.lower() not in WEEKDAYS:
+        return None
+    month = MONTHS.get(match.group('month').lower())
+    if not month:
         return None
+    if match.group('year'):
+        if year:
+            return None  # two years; leave it to dateutil as before
+        year = match.group('year')
+    year = int(year) if year else datetime.now().year
+    try:
+        return datetime(year, month, int(match.group('day'))).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date(date_str, year):
+    parsed = _fast_parse_date(date_str, year)
+    if parsed:
+        return parsed
+    return parse_date_dateutil(date_str, year)
+
+
+def parse_date_dateutil(date_str, year=None):
+    """Parse a date with dateutil's fuzzy parser (the general fallback)."""
     try:
         if year:
             date_str = f"{date_str} {year}"
         parsed = date_parser.parse(date_str, fuzzy=True)
         return parsed.strftime('%Y-%m-%d')
-    except (ValueError, TypeError) as e:
+    except (ValueError, TypeError, OverflowError) as e:
         logger.warning(f"Could not parse date: {date_str} - {e}")
         return None
 
 
+def parse_date(date_str, year=None):
+    """Parse various date formats into YYYY-MM-DD.
+
+    Month/day strings like "Friday, February 13" or "Feb. 7" are handled by a
+    precompiled pattern and lookup tables; anything else goes to dateutil.
+    Results are memoized, since scrapers see the same few dates repeatedly.
+    """
+    if not date_str:
+        return None
+    return _parse_date(date_str, year)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_time(time_str):
     """Normalize time format to 'H:MM PM' style."""
     if not time_str:
         return None
     time_str = time_str.strip().upper()
+    match = TIME_PATTERN.fullmatch(time_str)
+    if match:
+        return f"{match.group(1)}:{match.group(2)} {match.group(3)}"
     # Handle various formats
-    time_str = re.sub(r'(\d{1,2}):(\d{2})\s*(AM|PM)', r'\1:\2 \3', time_str)
-    time_str = re.sub(r'(\d{1,2})(AM|PM)', r'\1:00 \2', time_str)
+    time_str = TIME_PATTERN.sub(r'\1:\2 \3', time_str)
+    time_str = TIME_HOUR_ONLY.sub(r'\1:00 \2', time_str)
     return time_str
 
 
+# "7:00 pm", "7:00PM", "11:30a.m.", "7pm"
+CLOCK_PATTERN = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?', re.IGNORECASE)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def time_to_minutes(time_str):
+    """Minutes since midnight for a 12-hour time string, or None if it isn't one."""
+    if not time_str:
+        return None
+    match = CLOCK_PATTERN.fullmatch(time_str.strip())
+    if not match:
+        return None
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    is_pm = match.group(3).lower() == 'p'
+    if is_pm and hour != 12:
+        hour += 12
+    elif not is_pm and hour == 12:
+        hour = 0
+    return hour * 60 + minute
+
+
+def format_minutes(minutes):
+    """Display string ('7:00 PM') for minutes since midnight."""
+    hour, minute = divmod(minutes, 60)
+    suffix = 'PM' if hour >= 12 else 'AM'
+    return f"{(hour % 12) or 12}:{minute:02d} {suffix}"
+
+
+# Set to False to build full trees everywhere (e.g. to benchmark the strainers)
+USE_STRAINERS = True
+
+
+def make_soup(markup, parse_only=None):
+    """Parse HTML with lxml, building only the subtrees matched by `parse_only`.
+
+    `parse_only` is a bs4.SoupStrainer. Scrapers pass one that keeps just the
+    elements they walk, which skips tree construction for the rest of the page.
+    """
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(markup, 'lxml', parse_only=parse_only if USE_STRAINERS else None)
+
+
 def clean_text(text):
     """Clean up text by removing extra whitespace."""
     if not text:
@@ -48,28 +202,160 @@ def clean_text(text):
     return ' '.join(text.split())
 
 
-def make_request(url, session=None, timeout=30, retries=2):
-    """Make HTTP request with error handling and retries."""
+class RateLimiter:
+    """Thread-safe per-host limiter that spaces requests evenly.
+
+    Each host gets at most `requests_per_second` requests; callers block in
+    wait() until their slot comes up. A rate of 0 or None disables limiting.
+    """
+
+    def __init__(self, requests_per_second=None):
+        self.requests_per_second = requests_per_second
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until a request to the host of `url` is allowed."""
+        if not self.requests_per_second:
+            return
+        host = urlparse(url).netloc
+        interval = 1.0 / self.requests_per_second
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _accept_encoding():
+    """Advertise brotli only when urllib3 can decode it."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return 'gzip, deflate'
+    return 'gzip, deflate, br'
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': _accept_encoding(),
+}
+
+# Connection pool size per host for the shared session
+POOL_MAXSIZE = 16
+
+# Retry backoff: base * 2**attempt seconds, scaled by random jitter, capped
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+_session = None
+_session_lock = threading.Lock()
+
+# Active scrapers.fixtures.FixtureStore, if responses are being recorded or replayed
+_fixture_store = None
+
+
+def set_fixture_store(store):
+    """Install a FixtureStore (or None) and return the previous one."""
+    global _fixture_store
+    previous, _fixture_store = _fixture_store, store
+    return previous
+
+
+def get_fixture_store():
+    """Return the active FixtureStore, or None."""
+    return _fixture_store
+
+
+def state_path(path):
+    """Where a scraper keeps the state file or directory `path`.
+
+    While a FixtureStore is active this is the same name in its scratch
+    directory, so benchmark runs leave the build's data/ untouched.
+    """
+    store = _fixture_store
+    if store is not None and store.state_dir is not None:
+        return store.state_dir / Path(path).name
+    return Path(path)
+
+
+def get_session():
+    """Return the process-wide keep-alive session shared by all scrapers."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with jitter for the given (0-based) retry attempt."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def make_request(url, session=None, timeout=30, retries=2, headers=None, rate_limiter=None, quiet=False, cache=None):
+    """Make HTTP request with error handling and retries.
+
+    Requests go through the shared pooled session unless one is passed in.
+    Connection errors, 429s and 5xx responses are retried with exponential
+    backoff; other 4xx responses fail immediately. Returns None on failure,
+    logging at debug level instead of error when `quiet` is set.
+
+    With an HTTPCache as `cache`, the request is sent with the stored
+    validators and a 304 is answered from the cached body. Responses carry
+    `from_cache` so callers can tell whether the page changed.
+    """
     import requests
-    import time
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-    }
+    store = _fixture_store
+    if store is not None and store.mode == 'replay':
+        return store.response(url)
+
+    session = session or get_session()
+    request_headers = headers
+    if cache is not None:
+        request_headers = {**(headers or {}), **cache.conditional_headers(url)}
 
     for attempt in range(retries + 1):
+        if rate_limiter:
+            rate_limiter.wait(url)
         try:
-            if session:
-                resp = session.get(url, headers=headers, timeout=timeout)
-            else:
-                resp = requests.get(url, headers=headers, timeout=timeout)
+            resp = session.get(url, headers=request_headers, timeout=timeout)
             resp.raise_for_status()
+            resp.from_cache = False
+            if cache is not None:
+                if resp.status_code == 304:
+                    resp = cache.revalidated(url, resp)
+                    if resp is None:
+                        # Body went missing and its entry was dropped, so this refetch
+                        # goes out without validators and stores the fresh body
+                        return make_request(url, session, timeout, retries, headers, rate_limiter, quiet, cache)
+                else:
+                    cache.store(url, resp)
+            if store is not None:
+                store.record(url, resp.content, resp.headers.get('Content-Type'), resp.encoding)
             return resp
         except requests.RequestException as e:
-            if attempt < retries:
-                time.sleep(2)
+            status = e.response.status_code if e.response is not None else None
+            retryable = status is None or status == 429 or status >= 500
+            if retryable and attempt < retries:
+                time.sleep(backoff_delay(attempt))
                 continue
-            logger.error(f"Request failed for {url}: {e}")
+            (logger.debug if quiet else logger.error)(f"Request failed for {url}: {e}")
             return None
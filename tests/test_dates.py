@@ -0,0 +1,78 @@
+"""The fast date parser in scrapers/utils must agree with dateutil.
+
+Run with: python -m unittest discover tests
+"""
+import logging
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers import utils
+
+
+SUFFIXES = {1: 'st', 2: 'nd', 3: 'rd', 21: 'st', 22: 'nd', 23: 'rd', 31: 'st'}
+
+
+def ordinal(day):
+    return f"{day}{SUFFIXES.get(day, 'th')}"
+
+
+def date_strings(year):
+    """Every day of `year` in each shape the scrapers see."""
+    days = [date(year, 1, 1) + timedelta(days=i) for i in range(366)]
+    for d in days:
+        if d.year != year:
+            break
+        other = d + timedelta(days=3)
+        yield d.strftime(f'%A, %B {d.day}')             # Friday, February 13
+        yield d.strftime(f'%a, %b {d.day}')             # Fri, Feb 13
+        yield d.strftime(f'%a %b. {d.day}')             # Fri Feb. 13
+        yield d.strftime(f'%b {d.day}')                 # Feb 13
+        yield d.strftime(f'%B {ordinal(d.day)}')        # February 13th
+        yield d.strftime(f'%B {d.day}, %Y')             # February 13, 2026
+        yield d.strftime(f'%A %B {d.day} %Y')           # Friday February 13 2026
+        yield other.strftime('%A, ') + d.strftime(f'%B {d.day}')  # weekday that doesn't match
+
+
+# Impossible days (February 29 only outside leap years), unknown words and non-dates
+IRREGULAR = ['February 30', 'February 29', 'April 31', 'Sept 31', 'June 0', 'Feb 32',
+             'Funday, February 13', 'Smarch 3', '7:00 PM', 'TBA', 'February']
+
+
+class ParseDateParityTest(unittest.TestCase):
+
+    def setUp(self):
+        utils._parse_date.cache_clear()
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def assertMatchesDateutil(self, date_str, year):
+        expected = utils.parse_date_dateutil(date_str, year)
+        fast = utils._fast_parse_date(date_str, year)
+        if fast is not None:
+            self.assertEqual(fast, expected, f"fast path on {date_str!r}, year={year}")
+        self.assertEqual(utils.parse_date(date_str, year), expected, f"{date_str!r}, year={year}")
+        return fast
+
+    def test_known_shapes_take_the_fast_path_and_match(self):
+        for year in (2026, 2028):  # 2028 is a leap year
+            for date_str in date_strings(year):
+                explicit = str(year) in date_str
+                fast = self.assertMatchesDateutil(date_str, None if explicit else year)
+                self.assertIsNotNone(fast, f"{date_str!r} fell back to dateutil")
+
+    def test_current_year_default(self):
+        for date_str in ['Friday, February 13', 'Mar 1', 'December 31st']:
+            self.assertMatchesDateutil(date_str, None)
+
+    def test_irregular_strings(self):
+        for date_str in IRREGULAR:
+            for year in (2026, 2028, None):
+                self.assertMatchesDateutil(date_str, year)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Letterboxd enrichment against a local stub of letterboxd.com.
+
+Run with: python -m unittest discover tests
+"""
+import functools
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers import letterboxd
+from scrapers.films import FilmIndex
+from scrapers.models import Catalog
+
+REQUESTS_PER_SECOND = 20
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves a minimal film page for /film/<slug>/ and 404s for anything 'missing'."""
+
+    def do_GET(self):
+        self.server.hits.append(time.monotonic())
+        parts = self.path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'film' and 'missing' not in parts[1]:
+            slug = parts[1]
+            body = (f'<html><head><title>{slug} (2000)</title>'
+                    f'<meta name="twitter:data2" content="3.5 out of 5"></head>'
+                    f'<body><h1 class="headline-1">{slug}</h1>'
+                    f'<a href="/director/someone/">Director of {slug}</a></body></html>').encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+        else:
+            body = b''
+            self.send_response(404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def listings():
+    """Screenings with repeated, differently cased and unknown titles."""
+    records = [{'title': f'Film {i % 8}', 'theater': 'Stub Theater', 'date': '2026-10-16', 'times': ['7:00 PM']}
+               for i in range(20)]
+    records += [
+        {'title': 'FILM 3 (2000)', 'theater': 'Other Theater', 'date': '2026-10-16'},
+        {'title': 'film 4', 'year': 2000, 'theater': 'Other Theater', 'date': '2026-10-17'},
+        {'title': 'The Missing Film', 'theater': 'Stub Theater', 'date': '2026-10-17'},
+    ]
+    return Catalog().screenings(records)
+
+
+class EnrichTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.hits = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.object(letterboxd, 'LETTERBOXD_URL', f'http://127.0.0.1:{self.server.server_port}').start()
+
+    def enrich(self, max_workers):
+        """Enrich fresh listings with empty caches; returns (results, request times)."""
+        self.server.hits = []
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        tmp = Path(tmp_dir.name)
+        with mock.patch.object(letterboxd, 'LetterboxdCache',
+                               functools.partial(letterboxd.LetterboxdCache, tmp / 'letterboxd_cache.json')), \
+                mock.patch.object(letterboxd, 'FilmIndex', functools.partial(FilmIndex, tmp / 'film_index.json')):
+            movies = letterboxd.enrich_movies_with_letterboxd(
+                listings(), max_workers=max_workers, requests_per_second=REQUESTS_PER_SECOND)
+        return [(m.film.title, m.film.letterboxd) for m in movies], sorted(self.server.hits)
+
+    def assertWithinRate(self, hits):
+        self.assertGreater(len(hits), 1)
+        # The limiter hands out evenly spaced slots; allow a little scheduling jitter
+        for count, hit in enumerate(hits[1:], start=1):
+            self.assertGreaterEqual(hit - hits[0], count / REQUESTS_PER_SECOND - 0.05)
+
+    def test_request_rate_stays_within_limit(self):
+        for workers in (1, 8):
+            with self.subTest(max_workers=workers):
+                _, hits = self.enrich(workers)
+                self.assertWithinRate(hits)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        serial, _ = self.enrich(1)
+        self.assertTrue(any(info for _, info in serial))
+        self.assertIn(('The Missing Film', None), serial)
+        for workers in (2, 4, 8):
+            with self.subTest(max_workers=workers):
+                self.assertEqual(self.enrich(workers)[0], serial)
+
+
+if __name__ == '__main__':
+    unittest.main()